@@ -1,15 +1,60 @@
+from typing import AsyncIterator, List
+
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 
-from app.functions.function_caller import openai_function_call
-from app.schema.user import UserQuery, UserResponse
+from app.functions.function_caller import (
+    openai_function_call,
+    stream_openai_function_call,
+)
+from app.functions.parallel import batch_query
+from app.schema.user import BatchUserResponse, UserQuery, UserResponse
 
 router = APIRouter(tags=["Search"])
 
 
+def _server_sent_event(data: str) -> str:
+    """Format a chunk of text as a server-sent event."""
+    return "".join(f"data: {line}\n" for line in data.split("\n")) + "\n"
+
+
 @router.post("/ai-search", response_model=UserResponse)
 async def ai_search(user_query: UserQuery):
     try:
-        result = openai_function_call(user_query.query, user_query.account_id)
+        result = await openai_function_call(user_query.query, user_query.account_id)
         return UserResponse(**result)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e)) from e
+
+
+@router.post("/ai-search/stream")
+async def ai_search_stream(user_query: UserQuery):
+    chunks = stream_openai_function_call(user_query.query, user_query.account_id)
+
+    # Wait for the first chunk so routing and SQL errors still become a 500
+    # instead of failing after the stream has started.
+    try:
+        first_chunk = await anext(chunks, "")
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e)) from e
+
+    async def event_stream() -> AsyncIterator[str]:
+        yield _server_sent_event(first_chunk)
+        async for chunk in chunks:
+            yield _server_sent_event(chunk)
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
+@router.post("/ai-search/batch", response_model=List[BatchUserResponse])
+async def ai_search_batch(user_queries: List[UserQuery]):
+    try:
+        return await batch_query(user_queries)
+    except HTTPException:
+        raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        raise HTTPException(status_code=500, detail=str(e)) from e
@@ -25,5 +25,47 @@ DB_CONFIG = {
     "port": getenv("DB_PORT"),
 }
 
+DB_POOL_MIN_SIZE = int(getenv("DB_POOL_MIN_SIZE", "4"))
+DB_POOL_MAX_SIZE = int(getenv("DB_POOL_MAX_SIZE", "20"))
+
+# Seconds after which a pooled connection is closed and replaced
+DB_POOL_MAX_LIFETIME = float(getenv("DB_POOL_MAX_LIFETIME", "3600"))
+
+# Executions of the same query on a connection before it is prepared server-side
+DB_PREPARE_THRESHOLD = int(getenv("DB_PREPARE_THRESHOLD", "0"))
+
+# Server-side guard against pooled connections stuck "idle in transaction" (ms)
+DB_IDLE_IN_TRANSACTION_TIMEOUT = int(getenv("DB_IDLE_IN_TRANSACTION_TIMEOUT", "60000"))
+
 # OpenAI Configuration
 OPENAI_API_KEY = getenv("OPENAI_API_KEY")
+
+# Retries (with exponential backoff) on rate limits and server errors
+OPENAI_MAX_RETRIES = int(getenv("OPENAI_MAX_RETRIES", "5"))
+
+# Seconds before a single OpenAI HTTP request times out
+OPENAI_TIMEOUT = float(getenv("OPENAI_TIMEOUT", "30"))
+
+# Seconds startup waits for OpenAI and for the initial database connections
+# before giving up on warming them up
+WARM_UP_TIMEOUT = float(getenv("WARM_UP_TIMEOUT", "5"))
+
+# Upper bound on batch queries answered concurrently, across all batch requests
+PARALLEL_MAX_CONCURRENCY = int(getenv("PARALLEL_MAX_CONCURRENCY", "8"))
+
+# Model that picks the SQL function to call, and model that writes the final answer
+ROUTER_MODEL = getenv("ROUTER_MODEL", "gpt-4o-mini")
+SUMMARY_MODEL = getenv("SUMMARY_MODEL", "gpt-4o-mini")
+
+# Semantic cache of answers: queries whose embeddings are at least this similar
+# (cosine) for the same account reuse the cached answer for TTL seconds. At most
+# MAX_ACCOUNTS accounts are cached at a time.
+EMBEDDING_MODEL = getenv("EMBEDDING_MODEL", "text-embedding-3-small")
+SEMANTIC_CACHE_THRESHOLD = float(getenv("SEMANTIC_CACHE_THRESHOLD", "0.95"))
+SEMANTIC_CACHE_TTL = float(getenv("SEMANTIC_CACHE_TTL", "300"))
+SEMANTIC_CACHE_MAX_ACCOUNTS = int(getenv("SEMANTIC_CACHE_MAX_ACCOUNTS", "10000"))
+
+# Results of the read-only SQL functions, keyed on name and arguments, are reused
+# for TTL seconds
+FUNCTION_CACHE_MAX_SIZE = int(getenv("FUNCTION_CACHE_MAX_SIZE", "1024"))
+FUNCTION_CACHE_TTL = float(getenv("FUNCTION_CACHE_TTL", "60"))
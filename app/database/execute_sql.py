@@ -1,19 +1,118 @@
-import psycopg2
-from psycopg2.extras import RealDictCursor
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
 
-from app.config import DB_CONFIG
+from psycopg.rows import dict_row
+from psycopg_pool import ConnectionPool
 
+from app.config import (
+    DB_CONFIG,
+    DB_IDLE_IN_TRANSACTION_TIMEOUT,
+    DB_POOL_MAX_LIFETIME,
+    DB_POOL_MAX_SIZE,
+    DB_POOL_MIN_SIZE,
+    DB_PREPARE_THRESHOLD,
+)
+
+_pool: ConnectionPool | None = None
+_pool_lock = threading.Lock()
+
+_deferred_queries: ContextVar[list | None] = ContextVar(
+    "deferred_queries", default=None
+)
+
+
+class _DeferredResult(tuple):
+    pass
+
+
+# What execute_sql returns for a deferred query: an empty, immutable
+# placeholder that can be told apart from any real (or post-processed) result
+DEFERRED_RESULT = _DeferredResult()
+
+
+def get_pool() -> ConnectionPool:
+    """
+    Return the process-wide connection pool, creating it on first use. When
+    every connection is in use, callers wait for one to be returned.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(
+                    min_size=DB_POOL_MIN_SIZE,
+                    max_size=DB_POOL_MAX_SIZE,
+                    kwargs={
+                        **DB_CONFIG,
+                        "options": f"-c idle_in_transaction_session_timeout={DB_IDLE_IN_TRANSACTION_TIMEOUT}",
+                        "row_factory": dict_row,
+                        # Queries run this many times on a connection become
+                        # server-side prepared statements, skipping parse and plan
+                        "prepare_threshold": DB_PREPARE_THRESHOLD,
+                    },
+                    # No health check (e.g. SELECT 1) when a connection is
+                    # handed out; stale ones are replaced after max_lifetime
+                    check=None,
+                    max_lifetime=DB_POOL_MAX_LIFETIME,
+                    open=True,
+                )
+    return _pool
+
+
+def close_pool() -> None:
+    """Close all pooled connections. The pool is recreated on the next query."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+
+
+@contextmanager
+def defer_sql():
+    """
+    Collect the (query, params) pairs passed to execute_sql inside the block
+    instead of running them, so they can be sent together with
+    execute_sql_batch. execute_sql returns DEFERRED_RESULT for deferred queries.
+    """
+    queries: list = []
+    token = _deferred_queries.set(queries)
+    try:
+        yield queries
+    finally:
+        _deferred_queries.reset(token)
+
+
+def execute_sql(query: str, params: tuple | dict | None = None):
+    """Execute a SQL query on a pooled connection and return the results."""
+    deferred = _deferred_queries.get()
+    if deferred is not None:
+        deferred.append((query, params))
+        return DEFERRED_RESULT
 
-def execute_sql(query: str, params: tuple | None = None):
-    """Execute a SQL query and return the results."""
     try:
-        with psycopg2.connect(**DB_CONFIG) as conn:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+        # Commits on success and rolls back on error before the connection
+        # goes back to the pool
+        with get_pool().connection() as conn:
+            with conn.cursor() as cur:
                 cur.execute(query, params)
                 result = cur.fetchall() if cur.description else []
-                command = query.strip().split()[0].lower()
-                if command in {"insert", "update", "delete", "create", "drop", "alter"}:
-                    conn.commit()
         return result
     except Exception as e:
         raise Exception(f"Database error: {str(e)}")
+
+
+def execute_sql_batch(queries: list[tuple[str, tuple | dict | None]]) -> list:
+    """
+    Execute several SQL queries in one transaction on a single pooled connection
+    and return their results in the same order. The queries are pipelined: all
+    of them are sent before waiting for the first result.
+    """
+    try:
+        with get_pool().connection() as conn:
+            with conn.pipeline():
+                cursors = [conn.execute(query, params) for query, params in queries]
+            return [cur.fetchall() if cur.description else [] for cur in cursors]
+    except Exception as e:
+        raise Exception(f"Database error: {str(e)}")
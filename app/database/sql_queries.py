@@ -1,5 +1,8 @@
 from app.database.execute_sql import execute_sql
 
+# Upper bound on the page size of the paginated transaction listings
+MAX_PAGE_SIZE = 100
+
 
 def get_recent_transactions(account_id: str):
     """
@@ -72,32 +75,38 @@ def get_all_transactions(account_id: str):
               highest_debit_amount, and their respective currencies.
     """
     query = """
-        WITH highest_credit AS (
-            SELECT category, SUM(amount) AS credit_sum, currency
+        WITH category_totals AS (
+            SELECT
+                category,
+                currency,
+                SUM(amount) AS total_amount,
+                SUM(amount) FILTER (WHERE transaction_type ILIKE '%%credit%%') AS credit_sum,
+                SUM(amount) FILTER (WHERE transaction_type ILIKE '%%debit%%') AS debit_sum
             FROM new_table
-            WHERE transaction_type ILIKE '%credit%'
-              AND account_id = %s
+            WHERE account_id = %s
             GROUP BY category, currency
+        ),
+        highest_credit AS (
+            SELECT category, credit_sum, currency
+            FROM category_totals
+            WHERE credit_sum IS NOT NULL
             ORDER BY credit_sum DESC
             LIMIT 1
         ),
         highest_debit AS (
-            SELECT category, SUM(amount) AS debit_sum, currency
-            FROM new_table
-            WHERE transaction_type ILIKE '%debit%'
-              AND account_id = %s
-            GROUP BY category, currency
+            SELECT category, debit_sum, currency
+            FROM category_totals
+            WHERE debit_sum IS NOT NULL
             ORDER BY debit_sum DESC
             LIMIT 1
         ),
         total_amounts AS (
-            SELECT 
-                SUM(amount) AS total_amount,
+            SELECT
+                SUM(total_amount) AS total_amount,
                 currency,
-                SUM(CASE WHEN transaction_type ILIKE '%credit%' THEN amount ELSE 0 END) AS total_credit,
-                SUM(CASE WHEN transaction_type ILIKE '%debit%' THEN amount ELSE 0 END) AS total_debit
-            FROM new_table
-            WHERE account_id = %s
+                COALESCE(SUM(credit_sum), 0) AS total_credit,
+                COALESCE(SUM(debit_sum), 0) AS total_debit
+            FROM category_totals
             GROUP BY currency
             ORDER BY total_amount DESC
             LIMIT 1
@@ -115,10 +124,16 @@ def get_all_transactions(account_id: str):
             (SELECT currency FROM highest_debit) AS highest_debit_currency
         FROM total_amounts;
     """
-    return execute_sql(query, (account_id, account_id, account_id))
+    return execute_sql(query, (account_id,))
 
 
-def get_transactions_by_date(date_str: str, account_id: str):
+def get_transactions_by_date(
+    date_str: str,
+    account_id: str,
+    limit: int = 100,
+    before: str | None = None,
+    before_id: int | None = None,
+):
     """
     Get all transactions for a specific date and account, retrieving individual amounts, currency,
     category, transaction type and bank name used to make the transaction.
@@ -126,51 +141,97 @@ def get_transactions_by_date(date_str: str, account_id: str):
     Args:
         date_str (str): Date in YYYY-MM-DD format.
         account_id (str): The unique identifier of the account.
+        limit (int, optional): Maximum number of transactions to return. Defaults to 100.
+        before (str, optional): Only return transactions dated before this timestamp. Pass the
+            "date" of the last row of the previous page to fetch the next page.
+        before_id (int, optional): The "id" of the last row of the previous page, so rows
+            sharing its "date" are not skipped.
 
     Returns:
-        List[Dict]: A list of transaction records with the individual amount, currency, category,
-                    transaction type and bank name.
+        List[Dict]: A list of transaction records, newest first, with the individual amount, currency,
+                    category, transaction type, bank name, date and id, plus total_rows: the number
+                    of matching rows including those past this page.
     """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
     query = """
         SELECT
             amount,
             currency,
             category,
             transaction_type,
-            bank_name
+            bank_name,
+            "date",
+            id,
+            COUNT(*) OVER () AS total_rows
         FROM new_table
-        WHERE DATE("date") = %s
-          AND account_id = %s;
+        WHERE "date" >= %s::date
+          AND "date" < %s::date + 1
+          AND account_id = %s
+          AND (
+            %s::timestamp IS NULL
+            OR ("date", id) < (%s::timestamp, COALESCE(%s::bigint, 0))
+          )
+        ORDER BY "date" DESC, id DESC
+        LIMIT %s;
     """
-    return execute_sql(query, (date_str, account_id))
+    return execute_sql(
+        query, (date_str, date_str, account_id, before, before, before_id, limit)
+    )
 
 
-def get_transactions_between_dates(start_date: str, end_date: str, account_id: str):
+def get_transactions_between_dates(
+    start_date: str,
+    end_date: str,
+    account_id: str,
+    limit: int = 100,
+    before: str | None = None,
+    before_id: int | None = None,
+):
     """
     Get individual amounts, currency, category, transaction type, and bank name
     for transactions between two dates for a specific account.
 
     Args:
         start_date (str): Start date in YYYY-MM-DD format.
-        end_date (str): End date in YYYY-MM-DD format.
+        end_date (str): End date in YYYY-MM-DD format (inclusive).
         account_id (str): The unique identifier of the account.
+        limit (int, optional): Maximum number of transactions to return. Defaults to 100.
+        before (str, optional): Only return transactions dated before this timestamp. Pass the
+            "date" of the last row of the previous page to fetch the next page.
+        before_id (int, optional): The "id" of the last row of the previous page, so rows
+            sharing its "date" are not skipped.
 
     Returns:
-        List[Dict]: A list of transaction records with the amount, currency, category,
-                    transaction_type and bank_name between the specified dates.
+        List[Dict]: A list of transaction records, newest first, with the amount, currency, category,
+                    transaction_type, bank_name, date and id between the specified dates, plus
+                    total_rows: the number of matching rows including those past this page.
     """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
     query = """
         SELECT
             amount,
             currency,
             category,
             transaction_type,
-            bank_name
+            bank_name,
+            "date",
+            id,
+            COUNT(*) OVER () AS total_rows
         FROM new_table
-        WHERE "date" BETWEEN %s AND (%s || ' 23:59:59')
-          AND account_id = %s;
+        WHERE "date" >= %s::date
+          AND "date" < %s::date + 1
+          AND account_id = %s
+          AND (
+            %s::timestamp IS NULL
+            OR ("date", id) < (%s::timestamp, COALESCE(%s::bigint, 0))
+          )
+        ORDER BY "date" DESC, id DESC
+        LIMIT %s;
     """
-    return execute_sql(query, (start_date, end_date, account_id))
+    return execute_sql(
+        query,
+        (start_date, end_date, account_id, before, before, before_id, limit),
+    )
 
 
 def get_transactions_last_month(account_id: str):
@@ -192,7 +253,11 @@ def get_transactions_last_month(account_id: str):
     """
     query = """
         WITH last_month AS (
-            SELECT *
+            SELECT
+                amount,
+                transaction_type,
+                category,
+                currency
             FROM new_table
             WHERE "date" >= date_trunc('month', current_date - interval '1 month')
               AND "date" < date_trunc('month', current_date)
@@ -201,7 +266,7 @@ def get_transactions_last_month(account_id: str):
         highest_spent_category AS (
             SELECT category, SUM(amount) AS total_spent, currency
             FROM last_month
-            WHERE transaction_type ILIKE '%debit%'
+            WHERE transaction_type ILIKE '%%debit%%'
             GROUP BY category, currency
             ORDER BY total_spent DESC
             LIMIT 1
@@ -210,8 +275,8 @@ def get_transactions_last_month(account_id: str):
             SELECT 
                 SUM(amount) as total_amount,
                 currency,
-                SUM(CASE WHEN transaction_type ILIKE '%credit%' THEN amount ELSE 0 END) AS total_received,
-                SUM(CASE WHEN transaction_type ILIKE '%debit%' THEN amount ELSE 0 END) AS total_spent
+                SUM(CASE WHEN transaction_type ILIKE '%%credit%%' THEN amount ELSE 0 END) AS total_received,
+                SUM(CASE WHEN transaction_type ILIKE '%%debit%%' THEN amount ELSE 0 END) AS total_spent
             FROM last_month
             GROUP BY currency
             ORDER BY total_amount DESC
@@ -232,7 +297,13 @@ def get_transactions_last_month(account_id: str):
     return execute_sql(query, (account_id,))
 
 
-def get_transactions_over(amount: float, account_id: str):
+def get_transactions_over(
+    amount: float,
+    account_id: str,
+    limit: int = 100,
+    before: str | None = None,
+    before_id: int | None = None,
+):
     """
     Get the individual amounts, currency, category, transaction type, and bank name for transactions
     with an amount greater than the specified value.
@@ -240,41 +311,79 @@ def get_transactions_over(amount: float, account_id: str):
     Args:
         amount (float): The minimum amount threshold.
         account_id (str): The unique identifier of the account.
+        limit (int, optional): Maximum number of transactions to return. Defaults to 100.
+        before (str, optional): Only return transactions dated before this timestamp. Pass the
+            "date" of the last row of the previous page to fetch the next page.
+        before_id (int, optional): The "id" of the last row of the previous page, so rows
+            sharing its "date" are not skipped.
 
     Returns:
-        List[Dict]: A list of transaction records with the specified columns.
+        List[Dict]: A list of transaction records, newest first, with the specified columns, date
+                    and id, plus total_rows: the number of matching rows including those past this page.
     """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
     query = """
         SELECT
             amount,
             currency,
             category,
             transaction_type,
-            bank_name
+            bank_name,
+            "date",
+            id,
+            COUNT(*) OVER () AS total_rows
         FROM new_table
         WHERE amount > %s
-          AND account_id = %s;
+          AND account_id = %s
+          AND (
+            %s::timestamp IS NULL
+            OR ("date", id) < (%s::timestamp, COALESCE(%s::bigint, 0))
+          )
+        ORDER BY "date" DESC, id DESC
+        LIMIT %s;
     """
-    return execute_sql(query, (amount, account_id))
+    return execute_sql(
+        query, (amount, account_id, before, before, before_id, limit)
+    )
 
 
-def get_transactions_below(amount: float, account_id: str):
+def get_transactions_below(
+    amount: float,
+    account_id: str,
+    limit: int = 100,
+    before: str | None = None,
+    before_id: int | None = None,
+):
     """
     List individual transaction amounts, currency, category, transaction type, and bank name for transactions \
-    below a specified amount for the given account.
+    below a specified amount for the given account, newest first, at most `limit` rows. Pass the "date" \
+    and "id" of the last row as `before` and `before_id` to fetch the next page; total_rows counts the \
+    matching rows including those past this page.
     """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
     query = """
         SELECT
             amount,
             currency,
             category,
             transaction_type,
-            bank_name
+            bank_name,
+            "date",
+            id,
+            COUNT(*) OVER () AS total_rows
         FROM new_table
         WHERE amount < %s
-          AND account_id = %s;
+          AND account_id = %s
+          AND (
+            %s::timestamp IS NULL
+            OR ("date", id) < (%s::timestamp, COALESCE(%s::bigint, 0))
+          )
+        ORDER BY "date" DESC, id DESC
+        LIMIT %s;
     """
-    return execute_sql(query, (amount, account_id))
+    return execute_sql(
+        query, (amount, account_id, before, before, before_id, limit)
+    )
 
 
 def get_deposits(account_id: str):
@@ -294,23 +403,25 @@ def get_deposits(account_id: str):
                 SUM(amount) as category_total,
                 currency
             FROM new_table
-            WHERE transaction_type ILIKE '%credit%'
+            WHERE transaction_type ILIKE '%%credit%%'
                 AND account_id = %s
             GROUP BY category, currency
+        ),
+        top_category AS (
+            SELECT category, category_total, currency
+            FROM deposit_totals
             ORDER BY category_total DESC
             LIMIT 1
         )
         SELECT
-            COALESCE(SUM(amount), 0) as total_deposits,
-            (SELECT currency FROM deposit_totals) as total_deposits_currency,
-            (SELECT category FROM deposit_totals) as highest_deposit_category,
-            (SELECT category_total FROM deposit_totals) as highest_category_amount,
-            (SELECT currency FROM deposit_totals) as highest_category_currency
-        FROM new_table
-        WHERE transaction_type ILIKE '%credit%'
-            AND account_id = %s;
+            COALESCE(SUM(category_total), 0) as total_deposits,
+            (SELECT currency FROM top_category) as total_deposits_currency,
+            (SELECT category FROM top_category) as highest_deposit_category,
+            (SELECT category_total FROM top_category) as highest_category_amount,
+            (SELECT currency FROM top_category) as highest_category_currency
+        FROM deposit_totals;
     """
-    return execute_sql(query, (account_id, account_id))
+    return execute_sql(query, (account_id,))
 
 
 def get_withdrawals(account_id: str):
@@ -330,23 +441,25 @@ def get_withdrawals(account_id: str):
                 SUM(amount) as category_total,
                 currency
             FROM new_table
-            WHERE transaction_type ILIKE '%debit%'
+            WHERE transaction_type ILIKE '%%debit%%'
                 AND account_id = %s
             GROUP BY category, currency
+        ),
+        top_category AS (
+            SELECT category, category_total, currency
+            FROM withdrawal_totals
             ORDER BY category_total DESC
             LIMIT 1
         )
         SELECT
-            COALESCE(SUM(amount), 0) as total_withdrawals,
-            (SELECT currency FROM withdrawal_totals) as total_withdrawals_currency,
-            (SELECT category FROM withdrawal_totals) as highest_withdrawal_category,
-            (SELECT category_total FROM withdrawal_totals) as highest_category_amount,
-            (SELECT currency FROM withdrawal_totals) as highest_category_currency
-        FROM new_table
-        WHERE transaction_type ILIKE '%debit%'
-            AND account_id = %s;
+            COALESCE(SUM(category_total), 0) as total_withdrawals,
+            (SELECT currency FROM top_category) as total_withdrawals_currency,
+            (SELECT category FROM top_category) as highest_withdrawal_category,
+            (SELECT category_total FROM top_category) as highest_category_amount,
+            (SELECT currency FROM top_category) as highest_category_currency
+        FROM withdrawal_totals;
     """
-    return execute_sql(query, (account_id, account_id))
+    return execute_sql(query, (account_id,))
 
 
 def get_transactions_by_category(category: str, account_id: str):
@@ -364,8 +477,8 @@ def get_transactions_by_category(category: str, account_id: str):
     """
     query = """
         SELECT
-            SUM(CASE WHEN transaction_type ILIKE '%credit%' THEN amount ELSE 0 END) AS credit_amount,
-            SUM(CASE WHEN transaction_type ILIKE '%debit%' THEN amount ELSE 0 END) AS debit_amount,
+            SUM(CASE WHEN transaction_type ILIKE '%%credit%%' THEN amount ELSE 0 END) AS credit_amount,
+            SUM(CASE WHEN transaction_type ILIKE '%%debit%%' THEN amount ELSE 0 END) AS debit_amount,
             SUM(amount) AS total_amount,
             MAX(currency) AS currency
         FROM new_table
@@ -391,8 +504,8 @@ def get_transactions_by_account_number(account_number: str, account_id: str):
     """
     query = """
         SELECT
-            SUM(CASE WHEN transaction_type ILIKE '%credit%' THEN amount ELSE 0 END) AS credit_amount,
-            SUM(CASE WHEN transaction_type ILIKE '%debit%' THEN amount ELSE 0 END) AS debit_amount,
+            SUM(CASE WHEN transaction_type ILIKE '%%credit%%' THEN amount ELSE 0 END) AS credit_amount,
+            SUM(CASE WHEN transaction_type ILIKE '%%debit%%' THEN amount ELSE 0 END) AS debit_amount,
             SUM(amount) AS total_amount,
             MAX(currency) AS currency
         FROM new_table
@@ -418,8 +531,8 @@ def get_transactions_by_bank_name(bank_name: str, account_id: str):
     """
     query = """
         SELECT
-            SUM(CASE WHEN transaction_type ILIKE '%credit%' THEN amount ELSE 0 END) AS credit_amount,
-            SUM(CASE WHEN transaction_type ILIKE '%debit%' THEN amount ELSE 0 END) AS debit_amount,
+            SUM(CASE WHEN transaction_type ILIKE '%%credit%%' THEN amount ELSE 0 END) AS credit_amount,
+            SUM(CASE WHEN transaction_type ILIKE '%%debit%%' THEN amount ELSE 0 END) AS debit_amount,
             SUM(amount) AS total_amount,
             MAX(currency) AS currency
         FROM new_table
@@ -444,8 +557,8 @@ def get_transactions_by_account_id(account_id: str):
     """
     query = """
         SELECT
-            SUM(CASE WHEN transaction_type ILIKE '%credit%' THEN amount ELSE 0 END) AS credit_amount,
-            SUM(CASE WHEN transaction_type ILIKE '%debit%' THEN amount ELSE 0 END) AS debit_amount,
+            SUM(CASE WHEN transaction_type ILIKE '%%credit%%' THEN amount ELSE 0 END) AS credit_amount,
+            SUM(CASE WHEN transaction_type ILIKE '%%debit%%' THEN amount ELSE 0 END) AS debit_amount,
             SUM(amount) AS total_amount,
             MAX(currency) AS currency
         FROM new_table
@@ -470,8 +583,8 @@ def get_transactions_by_currency(currency: str, account_id: str):
     """
     query = """
         SELECT
-            SUM(CASE WHEN transaction_type ILIKE '%credit%' THEN amount ELSE 0 END) AS credit_amount,
-            SUM(CASE WHEN transaction_type ILIKE '%debit%' THEN amount ELSE 0 END) AS debit_amount,
+            SUM(CASE WHEN transaction_type ILIKE '%%credit%%' THEN amount ELSE 0 END) AS credit_amount,
+            SUM(CASE WHEN transaction_type ILIKE '%%debit%%' THEN amount ELSE 0 END) AS debit_amount,
             SUM(amount) AS total_amount
         FROM new_table
         WHERE currency = %s
@@ -495,7 +608,11 @@ def get_withdrawals_over_last_days(amount: float, account_id: str, days: int = 3
     """
     query = """
         WITH filtered_transactions AS (
-            SELECT *
+            SELECT
+                amount,
+                transaction_type,
+                category,
+                currency
             FROM new_table
             WHERE amount > %s
               AND "date" >= current_date - (%s || ' days')::interval
@@ -504,7 +621,7 @@ def get_withdrawals_over_last_days(amount: float, account_id: str, days: int = 3
         top_category AS (
             SELECT category, SUM(amount) as category_total, currency
             FROM filtered_transactions
-            WHERE transaction_type ILIKE '%debit%'
+            WHERE transaction_type ILIKE '%%debit%%'
             GROUP BY category, currency
             ORDER BY category_total DESC
             LIMIT 1
@@ -512,8 +629,8 @@ def get_withdrawals_over_last_days(amount: float, account_id: str, days: int = 3
         totals AS (
             SELECT 
                 SUM(amount) as total_sum,
-                SUM(CASE WHEN transaction_type ILIKE '%debit%' THEN amount ELSE 0 END) as total_spent,
-                SUM(CASE WHEN transaction_type ILIKE '%credit%' THEN amount ELSE 0 END) as total_received,
+                SUM(CASE WHEN transaction_type ILIKE '%%debit%%' THEN amount ELSE 0 END) as total_spent,
+                SUM(CASE WHEN transaction_type ILIKE '%%credit%%' THEN amount ELSE 0 END) as total_received,
                 currency
             FROM filtered_transactions
             GROUP BY currency
@@ -553,8 +670,8 @@ def get_transactions_by_bank_and_category(
         WITH totals AS (
             SELECT
                 SUM(amount) as total_sum,
-                SUM(CASE WHEN transaction_type ILIKE '%debit%' THEN amount ELSE 0 END) as total_spent,
-                SUM(CASE WHEN transaction_type ILIKE '%credit%' THEN amount ELSE 0 END) as total_received,
+                SUM(CASE WHEN transaction_type ILIKE '%%debit%%' THEN amount ELSE 0 END) as total_spent,
+                SUM(CASE WHEN transaction_type ILIKE '%%credit%%' THEN amount ELSE 0 END) as total_received,
                 currency
             FROM new_table
             WHERE bank_name ILIKE %s
@@ -593,7 +710,11 @@ def get_transactions_between_amounts_and_category(
     """
     query = """
         WITH filtered_transactions AS (
-            SELECT *
+            SELECT
+                amount,
+                transaction_type,
+                category,
+                currency
             FROM new_table
             WHERE amount BETWEEN %s AND %s
               AND category ILIKE %s
@@ -602,7 +723,7 @@ def get_transactions_between_amounts_and_category(
         top_category AS (
             SELECT category, SUM(amount) as category_total, currency
             FROM filtered_transactions 
-            WHERE transaction_type ILIKE '%debit%'
+            WHERE transaction_type ILIKE '%%debit%%'
             GROUP BY category, currency
             ORDER BY category_total DESC
             LIMIT 1
@@ -610,8 +731,8 @@ def get_transactions_between_amounts_and_category(
         totals AS (
             SELECT 
                 SUM(amount) as total_sum,
-                SUM(CASE WHEN transaction_type ILIKE '%debit%' THEN amount ELSE 0 END) as total_spent,
-                SUM(CASE WHEN transaction_type ILIKE '%credit%' THEN amount ELSE 0 END) as total_received,
+                SUM(CASE WHEN transaction_type ILIKE '%%debit%%' THEN amount ELSE 0 END) as total_spent,
+                SUM(CASE WHEN transaction_type ILIKE '%%credit%%' THEN amount ELSE 0 END) as total_received,
                 currency
             FROM filtered_transactions
             GROUP BY currency
@@ -646,7 +767,11 @@ def get_transactions_updated_since(specific_date: str, account_id: str):
     """
     query = """
         WITH filtered_transactions AS (
-            SELECT *
+            SELECT
+                amount,
+                transaction_type,
+                category,
+                currency
             FROM new_table
             WHERE updated_at >= %s
               AND account_id = %s
@@ -654,15 +779,15 @@ def get_transactions_updated_since(specific_date: str, account_id: str):
         highest_spend_category AS (
             SELECT category, SUM(amount) as category_total
             FROM filtered_transactions
-            WHERE transaction_type ILIKE '%debit%'
+            WHERE transaction_type ILIKE '%%debit%%'
             GROUP BY category
             ORDER BY category_total DESC
             LIMIT 1
         )
         SELECT 
             COALESCE(SUM(amount), 0) as total_sum,
-            COALESCE(SUM(CASE WHEN transaction_type ILIKE '%debit%' THEN amount ELSE 0 END), 0) as total_spent,
-            COALESCE(SUM(CASE WHEN transaction_type ILIKE '%credit%' THEN amount ELSE 0 END), 0) as total_received,
+            COALESCE(SUM(CASE WHEN transaction_type ILIKE '%%debit%%' THEN amount ELSE 0 END), 0) as total_spent,
+            COALESCE(SUM(CASE WHEN transaction_type ILIKE '%%credit%%' THEN amount ELSE 0 END), 0) as total_received,
             (SELECT category FROM highest_spend_category) as highest_spend_category,
             (SELECT category_total FROM highest_spend_category) as highest_spend_amount
         FROM filtered_transactions;
@@ -682,7 +807,11 @@ def get_transactions_created_last_week(account_id: str):
     """
     query = """
         WITH last_week_transactions AS (
-            SELECT *
+            SELECT
+                amount,
+                transaction_type,
+                category,
+                currency
             FROM new_table
             WHERE created_at >= current_date - interval '7 days'
               AND account_id = %s
@@ -693,7 +822,7 @@ def get_transactions_created_last_week(account_id: str):
                 SUM(amount) as spent_amount,
                 currency
             FROM last_week_transactions
-            WHERE transaction_type ILIKE '%debit%'
+            WHERE transaction_type ILIKE '%%debit%%'
             GROUP BY category, currency
             ORDER BY spent_amount DESC
             LIMIT 1
@@ -701,8 +830,8 @@ def get_transactions_created_last_week(account_id: str):
         totals AS (
             SELECT 
                 SUM(amount) as total_sum,
-                SUM(CASE WHEN transaction_type ILIKE '%debit%' THEN amount ELSE 0 END) as total_spent,
-                SUM(CASE WHEN transaction_type ILIKE '%credit%' THEN amount ELSE 0 END) as total_received,
+                SUM(CASE WHEN transaction_type ILIKE '%%debit%%' THEN amount ELSE 0 END) as total_spent,
+                SUM(CASE WHEN transaction_type ILIKE '%%credit%%' THEN amount ELSE 0 END) as total_received,
                 currency
             FROM last_week_transactions
             GROUP BY currency
@@ -736,22 +865,98 @@ def get_transactions_by_keyword(keyword: str, account_id: str):
     Returns:
         Dict: A dictionary containing credit_amount, debit_amount and total_amount with currencies for matches
     """
-    query = f"""
+    query = """
         SELECT
-            SUM(CASE WHEN transaction_type ILIKE '%credit%' THEN amount ELSE 0 END) AS credit_amount_{keyword},
-            SUM(CASE WHEN transaction_type ILIKE '%debit%' THEN amount ELSE 0 END) AS debit_amount_{keyword},
-            SUM(amount) AS total_amount_{keyword},
+            SUM(CASE WHEN transaction_type ILIKE '%%credit%%' THEN amount ELSE 0 END) AS credit_amount,
+            SUM(CASE WHEN transaction_type ILIKE '%%debit%%' THEN amount ELSE 0 END) AS debit_amount,
+            SUM(amount) AS total_amount,
             MAX(currency) as currency
         FROM new_table
-        WHERE account_id = %s
+        WHERE account_id = %(account_id)s
           AND (
-              bank_name ILIKE %s OR
-              category ILIKE %s OR
-              transaction_type ILIKE %s
+              bank_name ILIKE '%%' || %(keyword)s || '%%' OR
+              category ILIKE '%%' || %(keyword)s || '%%' OR
+              transaction_type ILIKE '%%' || %(keyword)s || '%%'
           )
         GROUP BY currency
-        ORDER BY total_amount_{keyword} DESC
+        ORDER BY total_amount DESC
         LIMIT 1;
     """
-    like_pattern = f"%{keyword}%"
-    return execute_sql(query, (account_id, like_pattern, like_pattern, like_pattern))
+    return execute_sql(query, {"account_id": account_id, "keyword": keyword})
+
+
+def get_multi_facet_sums(
+    account_id: str,
+    bank_name: str | None = None,
+    category: str | None = None,
+    currency: str | None = None,
+    keyword: str | None = None,
+):
+    """
+    Get credit amount, debit amount and total sum for several filters at once (bank name, category,
+    currency and keyword), plus the totals for the whole account, in a single query.
+
+    Args:
+        account_id (str): The unique identifier of the account.
+        bank_name (str, optional): The name of the bank to filter by.
+        category (str, optional): The transaction category to filter by.
+        currency (str, optional): The currency code to filter by (e.g., 'USD', 'NGN').
+        keyword (str, optional): Keyword to search across bank_name, category and transaction_type columns.
+
+    Returns:
+        List[Dict]: One row per requested facet ('account_id', 'bank_name', 'category', 'currency',
+                    'keyword') containing credit_amount, debit_amount, total_amount and currency.
+    """
+    query = """
+        WITH facet_rows AS (
+            SELECT
+                f.facet,
+                t.amount,
+                t.transaction_type,
+                t.currency
+            FROM new_table t
+            CROSS JOIN LATERAL (
+                VALUES
+                    ('account_id', TRUE),
+                    ('bank_name', t.bank_name ILIKE %(bank_name)s),
+                    ('category', t.category ILIKE %(category)s),
+                    ('currency', t.currency = %(currency)s),
+                    (
+                        'keyword',
+                        t.bank_name ILIKE '%%' || %(keyword)s || '%%'
+                        OR t.category ILIKE '%%' || %(keyword)s || '%%'
+                        OR t.transaction_type ILIKE '%%' || %(keyword)s || '%%'
+                    )
+            ) AS f(facet, matched)
+            WHERE t.account_id = %(account_id)s
+              AND f.matched
+        ),
+        facet_totals AS (
+            SELECT
+                facet,
+                SUM(CASE WHEN transaction_type ILIKE '%%credit%%' THEN amount ELSE 0 END) AS credit_amount,
+                SUM(CASE WHEN transaction_type ILIKE '%%debit%%' THEN amount ELSE 0 END) AS debit_amount,
+                SUM(amount) AS total_amount,
+                currency
+            FROM facet_rows
+            GROUP BY facet, currency
+        )
+        SELECT DISTINCT ON (facet)
+            facet,
+            credit_amount,
+            debit_amount,
+            total_amount,
+            currency
+        FROM facet_totals
+        ORDER BY facet, total_amount DESC;
+    """
+    return execute_sql(
+        query,
+        {
+            "account_id": account_id,
+            "bank_name": bank_name,
+            "category": category,
+            "currency": currency,
+            "keyword": keyword,
+        },
+    )
@@ -0,0 +1,178 @@
+import asyncio
+import logging
+from typing import Any, Dict, List, Tuple
+
+import orjson
+from openai.types.chat import ChatCompletion
+
+from app.config import ROUTER_MODEL, SUMMARY_MODEL
+from app.functions.function_caller import (
+    SUMMARY_MAX_TOKENS,
+    build_messages,
+    build_result_messages,
+    dispatch_function_calls,
+    generate_functions_list,
+    parse_tool_calls,
+    template_response,
+)
+from app.functions.openai_client import client
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+BATCH_COMPLETION_WINDOW = "24h"
+BATCH_TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+logger = logging.getLogger(__name__)
+
+
+async def submit_batch(
+    bodies: List[Dict[str, Any]], poll_interval: float = 30.0
+) -> List[ChatCompletion | Exception]:
+    """
+    Run chat completion requests through the OpenAI Batch API and wait for them.
+
+    Args:
+        bodies (List[Dict[str, Any]]): Chat completion request bodies.
+        poll_interval (float): Seconds to wait between batch status checks.
+
+    Returns:
+        List[ChatCompletion | Exception]: One entry per body, in the same order;
+        requests that failed inside the batch are returned as exceptions.
+    """
+    if not bodies:
+        return []
+
+    lines = [
+        orjson.dumps(
+            {
+                "custom_id": str(index),
+                "method": "POST",
+                "url": BATCH_ENDPOINT,
+                "body": body,
+            }
+        )
+        for index, body in enumerate(bodies)
+    ]
+    batch_file = await client.files.create(
+        file=("batch.jsonl", b"\n".join(lines)), purpose="batch"
+    )
+    batch = await client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint=BATCH_ENDPOINT,
+        completion_window=BATCH_COMPLETION_WINDOW,
+    )
+    logger.info("Submitted batch %s with %d requests", batch.id, len(bodies))
+
+    while batch.status not in BATCH_TERMINAL_STATUSES:
+        await asyncio.sleep(poll_interval)
+        batch = await client.batches.retrieve(batch.id)
+
+    if batch.status != "completed":
+        raise Exception(f"Batch {batch.id} ended with status {batch.status}")
+
+    results: List[ChatCompletion | Exception] = [
+        Exception("Missing from batch output") for _ in bodies
+    ]
+    for file_id in (batch.output_file_id, batch.error_file_id):
+        if not file_id:
+            continue
+
+        content = await client.files.content(file_id)
+        for line in content.text.splitlines():
+            if not line.strip():
+                continue
+
+            record = orjson.loads(line)
+            response = record.get("response") or {}
+            index = int(record["custom_id"])
+
+            if record.get("error") or response.get("status_code") != 200:
+                error = record.get("error") or response.get("body", {}).get("error")
+                results[index] = Exception(f"Batch request failed: {error}")
+            else:
+                results[index] = ChatCompletion.model_validate(response["body"])
+
+    return results
+
+
+async def batch_openai_function_call(
+    queries: List[Tuple[str, str]], poll_interval: float = 30.0
+) -> List[Dict[str, Any]]:
+    """
+    Answer many user queries offline through the OpenAI Batch API, for reports
+    and backfills where latency does not matter. Tool selection for all queries
+    runs as one batch, the requested functions are executed locally, and the
+    summaries are produced by a second batch.
+
+    Args:
+        queries (List[Tuple[str, str]]): (user_query, account_id) pairs.
+        poll_interval (float): Seconds to wait between batch status checks.
+
+    Returns:
+        List[Dict[str, Any]]: One dictionary per query, in the same order, with
+        either the natural language response or an error message.
+    """
+    conversations = [build_messages(user_query) for user_query, _ in queries]
+    responses: List[Dict[str, Any] | None] = [None] * len(queries)
+
+    routed = await submit_batch(
+        [
+            {
+                "model": ROUTER_MODEL,
+                "messages": messages,
+                "tools": generate_functions_list(),
+                "tool_choice": "auto",
+            }
+            for messages in conversations
+        ],
+        poll_interval,
+    )
+
+    pending = []
+    for index, completion in enumerate(routed):
+        if isinstance(completion, Exception):
+            responses[index] = {"error": str(completion)}
+            continue
+
+        message = completion.choices[0].message
+        if not message.tool_calls:
+            responses[index] = {"nl_response": message.content}
+            continue
+
+        # A bad tool call (e.g. an unknown function) fails only its own query
+        try:
+            calls = parse_tool_calls(message.tool_calls, queries[index][1])
+            results = await asyncio.to_thread(dispatch_function_calls, calls)
+        except Exception as e:
+            responses[index] = {"error": str(e)}
+            continue
+
+        templated = template_response(calls, results)
+        if templated is not None:
+            responses[index] = {"nl_response": templated}
+            continue
+
+        conversations[index].append(message.model_dump(exclude_none=True))
+        conversations[index].extend(
+            build_result_messages(message.tool_calls, calls, results)
+        )
+        pending.append(index)
+
+    summaries = await submit_batch(
+        [
+            {
+                "model": SUMMARY_MODEL,
+                "messages": conversations[index],
+                "max_tokens": SUMMARY_MAX_TOKENS,
+            }
+            for index in pending
+        ],
+        poll_interval,
+    )
+
+    for index, completion in zip(pending, summaries):
+        if isinstance(completion, Exception):
+            responses[index] = {"error": str(completion)}
+        else:
+            responses[index] = {"nl_response": completion.choices[0].message.content}
+
+    return responses
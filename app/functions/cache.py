@@ -0,0 +1,103 @@
+import time
+from typing import List, NamedTuple
+
+import numpy as np
+from cachetools import TTLCache
+
+
+class _AccountEntries(NamedTuple):
+    vectors: np.ndarray
+    expires_at: np.ndarray
+    responses: List[str]
+
+
+class SemanticCache:
+    """
+    In-memory cache of natural language responses keyed on the meaning of the
+    user query rather than its exact text. A lookup hits when a stored query
+    embedding for the same account has a cosine similarity of at least
+    `threshold`. Entries expire after `ttl` seconds so new transactions show up.
+    At most `max_accounts` accounts are kept; accounts with no store for `ttl`
+    seconds are dropped, then the least recently used ones.
+    """
+
+    def __init__(
+        self,
+        threshold: float,
+        ttl: float,
+        max_entries_per_account: int = 256,
+        max_accounts: int = 10_000,
+    ):
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries_per_account = max_entries_per_account
+        self._accounts: TTLCache = TTLCache(
+            maxsize=max_accounts, ttl=ttl, timer=time.monotonic
+        )
+
+    @staticmethod
+    def _normalize(embedding) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _live_entries(self, account_id: str) -> _AccountEntries | None:
+        entries = self._accounts.get(account_id)
+        if entries is None:
+            return None
+
+        alive = entries.expires_at > time.monotonic()
+        if alive.all():
+            return entries
+
+        if not alive.any():
+            self.clear(account_id)
+            return None
+
+        entries = _AccountEntries(
+            entries.vectors[alive],
+            entries.expires_at[alive],
+            [response for response, keep in zip(entries.responses, alive) if keep],
+        )
+        self._accounts[account_id] = entries
+        return entries
+
+    def lookup(self, account_id: str, embedding) -> str | None:
+        """
+        Return the cached response for the most similar query of the account,
+        or None if no live entry reaches the similarity threshold.
+        """
+        entries = self._live_entries(account_id)
+        if entries is None:
+            return None
+
+        scores = entries.vectors @ self._normalize(embedding)
+        best = int(np.argmax(scores))
+        if scores[best] < self.threshold:
+            return None
+        return entries.responses[best]
+
+    def store(self, account_id: str, embedding, response: str) -> None:
+        """Cache a response for a query embedding of the given account."""
+        vector = self._normalize(embedding)[np.newaxis, :]
+        expires_at = np.array([time.monotonic() + self.ttl])
+
+        entries = self._live_entries(account_id)
+        if entries is None:
+            self._accounts[account_id] = _AccountEntries(vector, expires_at, [response])
+            return
+
+        # Keep the newest entries when the account is over its limit
+        start = max(len(entries.responses) - (self.max_entries_per_account - 1), 0)
+        self._accounts[account_id] = _AccountEntries(
+            np.vstack([entries.vectors[start:], vector]),
+            np.concatenate([entries.expires_at[start:], expires_at]),
+            entries.responses[start:] + [response],
+        )
+
+    def clear(self, account_id: str | None = None) -> None:
+        """Drop the cached responses of one account, or of every account."""
+        if account_id is None:
+            self._accounts.clear()
+        else:
+            self._accounts.pop(account_id, None)
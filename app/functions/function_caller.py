@@ -1,78 +1,175 @@
-import inspect
-import json
+import asyncio
+import functools
 import logging
-from typing import Any, Callable, Dict
-
-from openai import OpenAI
-from pydantic import create_model
-
-from app.config import OPENAI_API_KEY
+import threading
+from collections import Counter
+from types import MappingProxyType
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    Tuple,
+    get_args,
+    get_type_hints,
+)
+
+import openai
+import orjson
+from cachetools import TTLCache
+from fastapi import HTTPException
+
+from app.config import (
+    EMBEDDING_MODEL,
+    FUNCTION_CACHE_MAX_SIZE,
+    FUNCTION_CACHE_TTL,
+    ROUTER_MODEL,
+    SEMANTIC_CACHE_MAX_ACCOUNTS,
+    SEMANTIC_CACHE_THRESHOLD,
+    SEMANTIC_CACHE_TTL,
+    SUMMARY_MODEL,
+    WARM_UP_TIMEOUT,
+)
 from app.database import sql_queries
+from app.database.execute_sql import (
+    DEFERRED_RESULT,
+    defer_sql,
+    execute_sql_batch,
+    get_pool,
+)
+from app.functions.cache import SemanticCache
+from app.functions.openai_client import client
+
+# Read-only: the tool definitions built from it at import must stay in sync
+FUNCTION_MAP: Mapping[str, Callable] = MappingProxyType(
+    {
+        "get_recent_transactions": sql_queries.get_recent_transactions,
+        "get_current_balance": sql_queries.get_current_balance,
+        "get_all_transactions": sql_queries.get_all_transactions,
+        "get_transactions_by_date": sql_queries.get_transactions_by_date,
+        "get_transactions_between_dates": sql_queries.get_transactions_between_dates,
+        "get_transactions_last_month": sql_queries.get_transactions_last_month,
+        "get_transactions_over": sql_queries.get_transactions_over,
+        "get_transactions_below": sql_queries.get_transactions_below,
+        "get_deposits": sql_queries.get_deposits,
+        "get_withdrawals": sql_queries.get_withdrawals,
+        "get_transactions_by_category": sql_queries.get_transactions_by_category,
+        "get_transactions_by_account_number": sql_queries.get_transactions_by_account_number,
+        "get_transactions_by_bank_name": sql_queries.get_transactions_by_bank_name,
+        "get_transactions_by_account_id": sql_queries.get_transactions_by_account_id,
+        "get_transactions_by_currency": sql_queries.get_transactions_by_currency,
+        "get_withdrawals_over_last_days": sql_queries.get_withdrawals_over_last_days,
+        "get_transactions_by_bank_and_category": sql_queries.get_transactions_by_bank_and_category,
+        "get_transactions_between_amounts_and_category": sql_queries.get_transactions_between_amounts_and_category,
+        "get_transactions_updated_since": sql_queries.get_transactions_updated_since,
+        "get_transactions_created_last_week": sql_queries.get_transactions_created_last_week,
+        "get_transactions_by_keyword": sql_queries.get_transactions_by_keyword,
+        "get_multi_facet_sums": sql_queries.get_multi_facet_sums,
+    }
+)
+
+# Single-filter aggregate functions that get_multi_facet_sums can answer in one
+# query, mapped to the facet (and argument name) they filter on.
+FACET_FUNCTIONS: Dict[str, str] = {
+    "get_transactions_by_account_id": "account_id",
+    "get_transactions_by_bank_name": "bank_name",
+    "get_transactions_by_category": "category",
+    "get_transactions_by_currency": "currency",
+    "get_transactions_by_keyword": "keyword",
+}
 
-FUNCTION_MAP: Dict[str, Callable] = {
-    "get_recent_transactions": sql_queries.get_recent_transactions,
-    "get_current_balance": sql_queries.get_current_balance,
-    "get_all_transactions": sql_queries.get_all_transactions,
-    "get_transactions_by_date": sql_queries.get_transactions_by_date,
-    "get_transactions_between_dates": sql_queries.get_transactions_between_dates,
-    "get_transactions_last_month": sql_queries.get_transactions_last_month,
-    "get_transactions_over": sql_queries.get_transactions_over,
-    "get_transactions_below": sql_queries.get_transactions_below,
-    "get_deposits": sql_queries.get_deposits,
-    "get_withdrawals": sql_queries.get_withdrawals,
-    "get_transactions_by_category": sql_queries.get_transactions_by_category,
-    "get_transactions_by_account_number": sql_queries.get_transactions_by_account_number,
-    "get_transactions_by_bank_name": sql_queries.get_transactions_by_bank_name,
-    "get_transactions_by_account_id": sql_queries.get_transactions_by_account_id,
-    "get_transactions_by_currency": sql_queries.get_transactions_by_currency,
-    "get_withdrawals_over_last_days": sql_queries.get_withdrawals_over_last_days,
-    "get_transactions_by_bank_and_category": sql_queries.get_transactions_by_bank_and_category,
-    "get_transactions_between_amounts_and_category": sql_queries.get_transactions_between_amounts_and_category,
-    "get_transactions_updated_since": sql_queries.get_transactions_updated_since,
-    "get_transactions_created_last_week": sql_queries.get_transactions_created_last_week,
-    "get_transactions_by_keyword": sql_queries.get_transactions_by_keyword,
+# JSON schema types for the parameter annotations used by the SQL functions;
+# anything else is described as a string.
+JSON_SCHEMA_TYPES: Dict[Any, str] = {
+    str: "string",
+    float: "number",
+    int: "integer",
+    bool: "boolean",
 }
 
-client = OpenAI(api_key=OPENAI_API_KEY)
+# Upper bounds on what a single function result may add to the conversation
+MAX_TOOL_RESULT_ROWS = 20
+MAX_TOOL_RESULT_CHARS = 8000
+
+# The final answer is a 2-3 sentence summary; cap its length
+SUMMARY_MAX_TOKENS = 300
+
+NO_RESULTS_RESPONSE = "No transactions found for that query."
+
+# Identical on every request and sent first, so together with the tool
+# definitions it forms a stable prefix for OpenAI's prompt caching.
+SYSTEM_PROMPT = (
+    "You are a financial assistant. Given a keyword, call "
+    "'get_transactions_by_keyword' to fetch relevant transactions. Automatically "
+    "correct grammar in user queries. Once function results are available, act "
+    "as a Financial Insight Analyst and provide a concise 2-3 sentence summary, "
+    "addressing the user as 'you'. Focus on key insights and avoid overly "
+    "technical language."
+)
+
+response_cache = SemanticCache(
+    threshold=SEMANTIC_CACHE_THRESHOLD,
+    ttl=SEMANTIC_CACHE_TTL,
+    max_accounts=SEMANTIC_CACHE_MAX_ACCOUNTS,
+)
 logger = logging.getLogger(__name__)
 
+# Every FUNCTION_MAP entry is a read-only query, so identical calls made shortly
+# after each other (e.g. while a user refines a question) can share a result.
+# Tool calls run in worker threads, hence the lock.
+function_cache: TTLCache = TTLCache(
+    maxsize=FUNCTION_CACHE_MAX_SIZE, ttl=FUNCTION_CACHE_TTL
+)
+_function_cache_lock = threading.Lock()
+
 
+@functools.lru_cache(maxsize=None)
 def generate_function_schema(func: Callable) -> Dict[str, Any]:
     """
     Automatically generate a JSON schema for the parameters of a function
-    using its signature and type hints.
+    using its type hints and the defaults stored on the function object.
     """
-    sig = inspect.signature(func)
-    fields = {}
+    hints = get_type_hints(func)
+    code = func.__code__
+    positional = code.co_varnames[: code.co_argcount]
+    keyword_only = code.co_varnames[
+        code.co_argcount : code.co_argcount + code.co_kwonlyargcount
+    ]
+
+    # Positional defaults belong to the trailing parameters
+    defaults = dict(zip(reversed(positional), reversed(func.__defaults__ or ())))
+    defaults.update(func.__kwdefaults__ or {})
+
+    properties = {}
     required = []
 
-    for name, param in sig.parameters.items():
+    for name in positional + keyword_only:
         if name == "self":
             continue
 
-        annotation = (
-            param.annotation if param.annotation is not inspect.Parameter.empty else str
-        )
-
-        if param.default is inspect.Parameter.empty:
-            default = ...
-            required.append(name)
-        else:
-            default = param.default
+        annotation = hints.get(name, str)
+        # Optional parameters (e.g. `str | None`) are described by their non-None type
+        non_none_args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        if non_none_args:
+            annotation = non_none_args[0]
 
-        fields[name] = (annotation, default)
+        properties[name] = {"type": JSON_SCHEMA_TYPES.get(annotation, "string")}
 
-    Model = create_model(func.__name__ + "Parameters", **fields)  # type: ignore
-    schema = Model.model_json_schema()
+        if name not in defaults:
+            required.append(name)
+        elif defaults[name] is not None:
+            properties[name]["default"] = defaults[name]
 
     return {
         "type": "object",
-        "properties": schema.get("properties", {}),
+        "properties": properties,
         "required": required,
     }
 
 
-def generate_functions_list() -> list:
+def build_functions_list() -> list:
     """
     Automatically generate the list of function definitions for OpenAI
     based on the FUNCTION_MAP. The description is taken from the function's
@@ -92,14 +189,124 @@ def generate_functions_list() -> list:
     ]
 
 
+# FUNCTION_MAP is static, so the tool definitions are built once at import.
+_FUNCTIONS_LIST = build_functions_list()
+
+
+def generate_functions_list() -> list:
+    """Return the OpenAI function definitions for FUNCTION_MAP."""
+    return _FUNCTIONS_LIST
+
+
+def _summarize_result(result: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Pre-aggregate a list of transaction rows into the figures the summary needs:
+    row count, date range, credit and debit totals and the categories with the
+    largest amounts per currency (amounts in different currencies are never
+    added together), and a few sample rows. For a page of a paginated listing,
+    also the total number of matching rows and, when more rows exist, the
+    before/before_id cursor of the next page.
+    """
+    totals: Dict[str, Dict[str, Any]] = {}
+    category_amounts: Dict[str, Counter] = {}
+    dates = []
+
+    for row in result:
+        currency = row.get("currency") or "unknown"
+        currency_totals = totals.setdefault(
+            currency, {"total_credit": 0, "total_debit": 0}
+        )
+        amount = row.get("amount") or 0
+        transaction_type = (row.get("transaction_type") or "").lower()
+        if "credit" in transaction_type:
+            currency_totals["total_credit"] += amount
+        elif "debit" in transaction_type:
+            currency_totals["total_debit"] += amount
+
+        category_amounts.setdefault(currency, Counter())[row.get("category")] += amount
+
+        if row.get("date") is not None:
+            dates.append(row["date"])
+
+    for currency, currency_totals in totals.items():
+        currency_totals["top_categories"] = category_amounts[currency].most_common(5)
+
+    summary = {
+        "count": len(result),
+        "date_range": [min(dates), max(dates)] if dates else None,
+        "totals": totals,
+        "sample": result[:5],
+    }
+
+    # Paginated listings report how many rows match in total; when this page
+    # is not all of them, say so and hand over the cursor for the next page
+    total_rows = result[0].get("total_rows")
+    if total_rows is not None:
+        summary["total_rows"] = total_rows
+        if total_rows > len(result):
+            last = result[-1]
+            summary["next_cursor"] = {
+                "before": last.get("date"),
+                "before_id": last.get("id"),
+            }
+
+    return summary
+
+
+def serialize_result(result: Any) -> str:
+    """
+    Serialize a function result for the model. Long lists of transactions are
+    replaced by their aggregates (see _summarize_result), other long lists are
+    cut down to their first MAX_TOOL_RESULT_ROWS rows plus the total row count,
+    and the text is capped at MAX_TOOL_RESULT_CHARS characters to bound prompt size.
+    """
+    if isinstance(result, list) and len(result) > MAX_TOOL_RESULT_ROWS:
+        if "amount" in result[0]:
+            result = _summarize_result(result)
+        else:
+            result = {"total_rows": len(result), "rows": result[:MAX_TOOL_RESULT_ROWS]}
+
+    return orjson.dumps(result, default=str).decode()[:MAX_TOOL_RESULT_CHARS]
+
+
+def _function_cache_key(
+    function_name: str, arguments: Dict[str, Any]
+) -> Tuple[str, bytes]:
+    # Serialized rather than hashed directly: the model may send lists or
+    # objects as argument values, which are not hashable
+    return function_name, orjson.dumps(
+        arguments, option=orjson.OPT_SORT_KEYS, default=str
+    )
+
+
+def _cached_result(key: Tuple) -> Any:
+    with _function_cache_lock:
+        return function_cache.get(key)
+
+
+def _cache_result(key: Tuple, result: Any) -> None:
+    # Errors are not cached so the next call retries the query
+    if isinstance(result, dict) and "error" in result:
+        return
+
+    with _function_cache_lock:
+        function_cache[key] = result
+
+
 def call_function_by_name(function_name: str, arguments: Dict[str, Any]) -> Any:
     """
     Given a function name and its arguments, look up the corresponding function
-    from FUNCTION_MAP and call it with the provided arguments.
+    from FUNCTION_MAP and call it with the provided arguments. Results are served
+    from function_cache when the same call was made within FUNCTION_CACHE_TTL.
     """
     if function_name not in FUNCTION_MAP:
         raise ValueError(f"Function {function_name} is not defined in the mapping.")
 
+    key = _function_cache_key(function_name, arguments)
+    result = _cached_result(key)
+    if result is not None:
+        return result
+
     func = FUNCTION_MAP[function_name]
 
     try:
@@ -107,95 +314,376 @@ def call_function_by_name(function_name: str, arguments: Dict[str, Any]) -> Any:
     except Exception as e:
         result = {"error": str(e)}
 
+    _cache_result(key, result)
+
     return result
 
 
-def generate_nl_response(function_result: dict) -> str:
+def call_functions_by_name(calls: List[Tuple[str, Dict[str, Any]]]) -> List[Any]:
     """
-    Generate a natural language summary based on the raw function result.
+    Batch version of call_function_by_name: the query issued by each function is
+    collected first, then all of them are sent together over one connection with
+    execute_sql_batch. Results are returned in the same order as the calls;
+    calls found in function_cache are not sent to the database.
+
+    Only a function whose body is exactly `return execute_sql(query, params)` can
+    be batched, since the raw rows of its query stand in for its return value.
+    Any other function (one that post-processes the rows or runs several
+    queries) is detected and called on its own instead.
+    """
+    results: List[Any] = [None] * len(calls)
+    queries = []
+    batched = []
+
+    for index, (function_name, arguments) in enumerate(calls):
+        if function_name not in FUNCTION_MAP:
+            raise ValueError(f"Function {function_name} is not defined in the mapping.")
+
+        results[index] = _cached_result(_function_cache_key(function_name, arguments))
+        if results[index] is not None:
+            continue
+
+        try:
+            with defer_sql() as deferred:
+                returned = FUNCTION_MAP[function_name](**arguments)
+        except Exception:
+            # Called on its own below, which reports the error
+            continue
+
+        if len(deferred) == 1 and returned is DEFERRED_RESULT:
+            batched.append(index)
+            queries.extend(deferred)
+
+    if queries:
+        try:
+            for index, result in zip(batched, execute_sql_batch(queries)):
+                results[index] = result
+                _cache_result(_function_cache_key(*calls[index]), result)
+        except Exception as e:
+            # One failing query aborts the whole transaction, so rerun them
+            # separately to give each call its own result or error.
+            logger.warning("Batched queries failed, running them separately: %s", e)
+
+    for index, (function_name, arguments) in enumerate(calls):
+        if results[index] is None:
+            results[index] = call_function_by_name(function_name, arguments)
+
+    return results
 
-    Args:
-        function_result (dict): The result from a function call (e.g., SQL query result).
+
+def dispatch_function_calls(calls: List[Tuple[str, Dict[str, Any]]]) -> List[Any]:
+    """
+    Call every (function_name, arguments) pair in a single database batch and
+    return the results in the same order. When a turn asks for two or more
+    different facets (e.g. by bank name and by category), those calls are merged
+    into a single get_multi_facet_sums query and each one receives the row for
+    its own facet.
+    """
+    results: List[Any] = [None] * len(calls)
+
+    facet_calls: Dict[str, int] = {}
+    for index, (function_name, _) in enumerate(calls):
+        facet = FACET_FUNCTIONS.get(function_name)
+        if facet and facet not in facet_calls:
+            facet_calls[facet] = index
+
+    batch = []
+    if len(facet_calls) > 1:
+        account_id = calls[next(iter(facet_calls.values()))][1].get("account_id")
+        facet_arguments = {
+            facet: calls[index][1].get(facet)
+            for facet, index in facet_calls.items()
+            if facet != "account_id"
+        }
+        batch.append(
+            ("get_multi_facet_sums", {"account_id": account_id, **facet_arguments})
+        )
+    else:
+        facet_calls = {}
+
+    merged = set(facet_calls.values())
+    remaining = [index for index in range(len(calls)) if index not in merged]
+    batch.extend(calls[index] for index in remaining)
+
+    batch_results = call_functions_by_name(batch)
+
+    if facet_calls:
+        rows = batch_results.pop(0)
+        for facet, index in facet_calls.items():
+            if isinstance(rows, dict):  # error result
+                results[index] = rows
+            else:
+                results[index] = [row for row in rows if row["facet"] == facet]
+
+    for index, result in zip(remaining, batch_results):
+        results[index] = result
+
+    return results
+
+
+def build_messages(user_query: str) -> List[Dict[str, Any]]:
+    """Return the opening messages of the conversation for a user query."""
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": user_query},
+    ]
+
+
+def parse_tool_calls(
+    tool_calls: List[Any], account_id: str
+) -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    Turn the tool calls of an assistant message into (function_name, arguments)
+    pairs scoped to the given account.
+    """
+    calls = []
+    for tool_call in tool_calls:
+        arguments = orjson.loads(tool_call.function.arguments)
+        arguments["account_id"] = account_id
+        calls.append((tool_call.function.name, arguments))
+
+    return calls
+
+
+def build_result_messages(
+    tool_calls: List[Any],
+    calls: List[Tuple[str, Dict[str, Any]]],
+    results: List[Any],
+) -> List[Dict[str, Any]]:
+    """Return one role=tool message per call carrying its serialized result."""
+    tool_messages = []
+    for tool_call, (function_name, arguments), result in zip(
+        tool_calls, calls, results
+    ):
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "call=%s args=%s rows=%d",
+                function_name,
+                arguments,
+                len(result) if isinstance(result, list) else 1,
+            )
+
+        tool_messages.append(
+            {
+                "role": "tool",
+                "tool_call_id": tool_call.id,
+                "content": serialize_result(result),
+            }
+        )
+
+    return tool_messages
+
+
+def template_response(
+    calls: List[Tuple[str, Dict[str, Any]]], results: List[Any]
+) -> str | None:
+    """
+    Answer trivial results directly instead of asking the model to summarize
+    them: a single balance lookup, or a single call that found nothing.
 
     Returns:
-        str: A natural language summary of the data.
-    """
-    prompt = (
-        "You are a Financial Insight Analyst. Given the following financial data,"
-        "provide a concise 2-3 sentence summary, addressing the user as 'you'.\
-        Focus on key insights and avoid overly technical language.\n\n"
-        "Financial Data:\n"
-        "--------------------------------------------------\n"
-        f"{function_result}\n"
-        "--------------------------------------------------\n\n"
-        "Please provide your summary."
-    )
+        str | None: The response, or None when the results need a summary.
+    """
+    if len(calls) != 1:
+        return None
+
+    function_name, result = calls[0][0], results[0]
+    if not isinstance(result, list):  # error result
+        return None
+
+    if not result:
+        return NO_RESULTS_RESPONSE
+
+    if function_name == "get_current_balance":
+        balance, currency = result[0]["balance_after"], result[0]["currency"]
+        if balance is None:
+            return None
+        if currency is None:
+            return f"You currently have {balance:,.2f} available."
+        return f"You currently have {currency} {balance:,.2f} available."
+
+    return None
+
+
+async def embed_query(user_query: str) -> List[float]:
+    """Return the embedding of a user query, used to look up cached responses."""
+    response = await client.embeddings.create(model=EMBEDDING_MODEL, input=user_query)
+    return response.data[0].embedding
+
+
+async def _embed_query_for_cache(user_query: str) -> List[float] | None:
+    """
+    embed_query for the response cache, which is best-effort: on failure the
+    error is logged and None returned, and the query is answered uncached.
+    """
+    try:
+        return await embed_query(user_query)
+    except Exception as e:
+        logger.warning("Query embedding failed, skipping the response cache: %s", e)
+        return None
+
+
+async def warm_up() -> None:
+    """
+    Pay the one-off costs of the first request up front: the tool definitions,
+    the TLS handshake to OpenAI and the initial database connections. Each step
+    gives up after WARM_UP_TIMEOUT seconds; failures are logged and left for
+    the first request to surface.
+    """
+    generate_functions_list()
+
+    try:
+        await client.with_options(max_retries=0, timeout=WARM_UP_TIMEOUT).models.list()
+    except Exception as e:
+        logger.warning("OpenAI warm-up failed: %s", e)
+
+    try:
+        pool = await asyncio.to_thread(get_pool)
+        await asyncio.to_thread(pool.wait, timeout=WARM_UP_TIMEOUT)
+    except Exception as e:
+        logger.warning("Database warm-up failed: %s", e)
+
 
-    response = client.chat.completions.create(
-        model="gpt-4",
-        messages=[
-            {"role": "system", "content": "You are a Financial Insight Analyst."},
-            {"role": "user", "content": prompt},
-        ],
+async def _route_query(
+    user_query: str, account_id: str
+) -> Tuple[str | None, List[Dict[str, Any]], List[float] | None]:
+    """
+    Run everything before the final summary: the semantic cache lookup, the
+    tool-selection completion and the requested Python functions. The query
+    embedding and the tool-selection completion are requested concurrently;
+    the completion is cancelled on a cache hit.
+
+    Returns:
+        Tuple: (answer, messages, embedding). `answer` is set when no summary
+        completion is needed (cache hit, the model answered directly, or the
+        result was simple enough to template);
+        otherwise `messages` holds the conversation including the tool results.
+        `embedding` is None when the query could not be embedded.
+    """
+    messages = build_messages(user_query)
+
+    embedding_task = asyncio.create_task(_embed_query_for_cache(user_query))
+    routing_task = asyncio.create_task(
+        client.chat.completions.create(
+            model=ROUTER_MODEL,
+            messages=messages,
+            tools=_FUNCTIONS_LIST,
+            tool_choice="auto",
+        )
     )
+    try:
+        embedding = await embedding_task
+        if embedding is not None:
+            cached_response = response_cache.lookup(account_id, embedding)
+            if cached_response is not None:
+                return cached_response, messages, embedding
+
+        response = await routing_task
+    finally:
+        # No-ops for finished tasks; stops the completion on a cache hit and
+        # both requests if this coroutine is cancelled
+        embedding_task.cancel()
+        routing_task.cancel()
+
+    message = response.choices[0].message
+
+    if not message.tool_calls:
+        return message.content, messages, embedding
 
-    nl_response = response.choices[0].message.content
-    logger.info(nl_response)
-    return nl_response
+    calls = parse_tool_calls(message.tool_calls, account_id)
+    # The SQL functions are blocking; run them off the event loop
+    results = await asyncio.to_thread(dispatch_function_calls, calls)
 
+    templated = template_response(calls, results)
+    if templated is not None:
+        return templated, messages, embedding
 
-def openai_function_call(user_query: str, account_id: str) -> Dict[str, Any]:
+    messages.append(message.model_dump(exclude_none=True))
+    messages.extend(build_result_messages(message.tool_calls, calls, results))
+
+    return None, messages, embedding
+
+
+async def openai_function_call(user_query: str, account_id: str) -> Dict[str, Any]:
     """
-    Send the user query to OpenAI with function calling enabled, parse the function
-    call response, and execute the corresponding Python function.
+    Send the user query to OpenAI with function calling enabled, execute the
+    requested Python functions and hand their results back to the model as tool
+    messages in the same conversation, so it answers with the final summary.
+    Answers are cached per account and reused for semantically similar queries.
 
     Args:
         user_query (str): The natural language query from the user.
         account_id (str): The user's account ID to scope the query.
 
     Returns:
-        Dict[str, Any]: Dictionary containing the function call results or direct response
-    """
-    tools = generate_functions_list()
-
-    messages = [
-        {"role": "user", "content": user_query},
-        {
-            "role": "system",
-            "content": "You are a financial assistant. Given a keyword, call 'get_transactions_by_keyword'\
-            to fetch relevant transactions. Automatically correct grammar in user queries.",
-        },
-    ]
+        Dict[str, Any]: Dictionary containing the natural language response
 
+    Raises:
+        HTTPException: 502 when an OpenAI API call fails.
+    """
     try:
-        response = client.chat.completions.create(
-            model="gpt-4", messages=messages, tools=tools, tool_choice="auto"
+        answer, messages, embedding = await _route_query(user_query, account_id)
+        if answer is not None:
+            return {"nl_response": answer}
+
+        response = await client.chat.completions.create(
+            model=SUMMARY_MODEL, messages=messages, max_tokens=SUMMARY_MAX_TOKENS
         )
 
-        message = response.choices[0].message
+        nl_response = response.choices[0].message.content
+        logger.info(nl_response)
 
-        if message.tool_calls:
-            tool_call = message.tool_calls[0]  # Get first tool call
-            function_name = tool_call.function.name
-            arguments = json.loads(tool_call.function.arguments)
+        if embedding is not None:
+            response_cache.store(account_id, embedding, nl_response)
 
-            arguments["account_id"] = account_id
+        return {"nl_response": nl_response}
 
-            result = call_function_by_name(function_name, arguments)
+    except openai.APIError as e:
+        raise HTTPException(status_code=502, detail=str(e)) from e
 
-            logger.debug(
-                {
-                    "called_function": function_name,
-                    "arguments": arguments,
-                    "result": result,
-                }
-            )
 
-            nl_response = generate_nl_response(result)
+async def stream_openai_function_call(
+    user_query: str, account_id: str
+) -> AsyncIterator[str]:
+    """
+    Same as openai_function_call, but yield the natural language response in
+    chunks as the summary completion produces them.
 
-            return {"nl_response": nl_response}
-        else:
-            return {"nl_response": message.content}
+    Args:
+        user_query (str): The natural language query from the user.
+        account_id (str): The user's account ID to scope the query.
 
-    except Exception as e:
-        raise Exception(f"Error during OpenAI API call: {str(e)}")
+    Yields:
+        str: Successive pieces of the natural language response.
+
+    Raises:
+        HTTPException: 502 when an OpenAI API call fails.
+    """
+    try:
+        answer, messages, embedding = await _route_query(user_query, account_id)
+        if answer is not None:
+            yield answer
+            return
+
+        stream = await client.chat.completions.create(
+            model=SUMMARY_MODEL,
+            messages=messages,
+            max_tokens=SUMMARY_MAX_TOKENS,
+            stream=True,
+        )
+
+        chunks = []
+        async for chunk in stream:
+            content = chunk.choices[0].delta.content if chunk.choices else None
+            if content:
+                chunks.append(content)
+                yield content
+
+        nl_response = "".join(chunks)
+        logger.info(nl_response)
+
+        if embedding is not None:
+            response_cache.store(account_id, embedding, nl_response)
+
+    except openai.APIError as e:
+        raise HTTPException(status_code=502, detail=str(e)) from e
@@ -0,0 +1,19 @@
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+from app.config import OPENAI_API_KEY, OPENAI_MAX_RETRIES, OPENAI_TIMEOUT
+
+# One HTTP/2 connection pool shared by every OpenAI call in the process, so
+# sequential and concurrent requests reuse (and multiplex over) open sockets
+# instead of paying a new TCP + TLS handshake.
+http_client = DefaultAsyncHttpxClient(
+    http2=True,
+    limits=httpx.Limits(max_keepalive_connections=50),
+    timeout=OPENAI_TIMEOUT,
+)
+
+client = AsyncOpenAI(
+    api_key=OPENAI_API_KEY,
+    max_retries=OPENAI_MAX_RETRIES,
+    http_client=http_client,
+)
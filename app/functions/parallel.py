@@ -0,0 +1,43 @@
+import asyncio
+from typing import List
+
+from fastapi import HTTPException
+
+from app.config import PARALLEL_MAX_CONCURRENCY
+from app.functions.function_caller import openai_function_call
+from app.schema.user import BatchUserResponse, UserQuery
+
+# Shared by every batch in the process, so concurrent batch requests together
+# stay within PARALLEL_MAX_CONCURRENCY queries talking to OpenAI at once
+_semaphore = asyncio.Semaphore(PARALLEL_MAX_CONCURRENCY)
+
+
+async def batch_query(queries: List[UserQuery]) -> List[BatchUserResponse]:
+    """
+    Answer several user queries concurrently, with at most
+    PARALLEL_MAX_CONCURRENCY queries (across all batches) talking to OpenAI at
+    the same time. Rate-limit and server errors are retried with exponential
+    backoff by the OpenAI client; a query that still fails gets an error
+    instead of failing the whole batch.
+
+    Args:
+        queries (List[UserQuery]): The queries to answer.
+
+    Returns:
+        List[BatchUserResponse]: One response per query, in the same order,
+        with either the natural language response or an error message.
+    """
+
+    async def run_one(user_query: UserQuery) -> BatchUserResponse:
+        try:
+            async with _semaphore:
+                result = await openai_function_call(
+                    user_query.query, user_query.account_id
+                )
+        except HTTPException as e:
+            return BatchUserResponse(error=str(e.detail))
+        except Exception as e:
+            return BatchUserResponse(error=str(e))
+        return BatchUserResponse(**result)
+
+    return list(await asyncio.gather(*(run_one(query) for query in queries)))
@@ -1,12 +1,32 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from app.api.v1.search import router as search_router
 from app import config
+from app.database.execute_sql import close_pool
+from app.functions.function_caller import warm_up
+from app.functions.openai_client import client
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await warm_up()
+    yield
+    close_pool()
+    await client.close()
 
 
 def get_application():
-    app = FastAPI(title=config.PROJECT_NAME, version=config.VERSION, description=config.DESCRIPTION)
+    app = FastAPI(
+        title=config.PROJECT_NAME,
+        version=config.VERSION,
+        description=config.DESCRIPTION,
+        lifespan=lifespan,
+        default_response_class=ORJSONResponse,
+    )
 
     app.add_middleware(
         CORSMiddleware,
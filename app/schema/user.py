@@ -8,3 +8,8 @@ class UserQuery(BaseModel):
 
 class UserResponse(BaseModel):
     nl_response: str
+
+
+class BatchUserResponse(BaseModel):
+    nl_response: str | None = None
+    error: str | None = None
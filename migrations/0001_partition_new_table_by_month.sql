@@ -0,0 +1,101 @@
+-- Range-partition new_table by month on "date".
+--
+-- Every query in app/database/sql_queries.py filters on account_id and most of
+-- them bound "date", so monthly partitions let PostgreSQL prune everything
+-- outside the requested window. The original heap is kept as
+-- new_table_unpartitioned; drop it once the migrated data has been verified.
+--
+-- Run with: psql -d "$DB_NAME" -f migrations/0001_partition_new_table_by_month.sql
+
+BEGIN;
+
+-- Written for the existing schema, where id is a serial column: its default
+-- is nextval('new_table_id_seq'). Rows with a NULL "date" cannot be placed in
+-- the new primary key, so they must be fixed or removed first.
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM pg_attribute
+        WHERE attrelid = 'new_table'::regclass
+          AND attname = 'id'
+          AND attidentity <> ''
+    ) THEN
+        RAISE EXCEPTION 'new_table.id is an identity column; this migration expects serial';
+    END IF;
+
+    IF EXISTS (SELECT 1 FROM new_table WHERE "date" IS NULL) THEN
+        RAISE EXCEPTION 'new_table has rows with a NULL "date"; fix or delete them first';
+    END IF;
+END
+$$;
+
+ALTER TABLE new_table RENAME TO new_table_unpartitioned;
+
+-- INCLUDING DEFAULTS copies id's nextval('new_table_id_seq') default, so new
+-- rows keep drawing from the same sequence and never collide with copied ids.
+CREATE TABLE new_table (
+    LIKE new_table_unpartitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS
+) PARTITION BY RANGE ("date");
+
+-- The sequence still belongs to the old heap; move it over so dropping
+-- new_table_unpartitioned later does not take the id default with it.
+ALTER SEQUENCE new_table_id_seq OWNED BY new_table.id;
+
+-- A primary key on a partitioned table must include the partition key, so the
+-- key is now (id, "date") instead of id alone, and "date" is NOT NULL.
+ALTER TABLE new_table ADD PRIMARY KEY (id, "date");
+
+-- Creates any missing monthly partitions, named new_table_yYYYYmMM, from the
+-- month of from_date up to months_ahead months after the current one. Rows
+-- outside the covered range land in the default partition, so this must run
+-- on a schedule (see "Database Migrations" in the README); a month whose rows
+-- already sit in the default partition cannot be created until they are moved.
+CREATE OR REPLACE FUNCTION create_new_table_partitions(
+    from_date date DEFAULT current_date,
+    months_ahead integer DEFAULT 12
+) RETURNS void
+LANGUAGE plpgsql AS $$
+DECLARE
+    month_start date := date_trunc('month', from_date)::date;
+    last_month date := (date_trunc('month', current_date)
+        + make_interval(months => months_ahead))::date;
+BEGIN
+    WHILE month_start <= last_month LOOP
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS %I PARTITION OF new_table FOR VALUES FROM (%L) TO (%L)',
+            'new_table_' || to_char(month_start, '"y"YYYY"m"MM'),
+            month_start,
+            (month_start + interval '1 month')::date
+        );
+        month_start := (month_start + interval '1 month')::date;
+    END LOOP;
+END
+$$;
+
+-- One partition per month from the oldest transaction up to a year ahead.
+SELECT create_new_table_partitions(
+    COALESCE((SELECT MIN("date") FROM new_table_unpartitioned)::date, current_date)
+);
+
+CREATE TABLE new_table_default PARTITION OF new_table DEFAULT;
+
+INSERT INTO new_table SELECT * FROM new_table_unpartitioned;
+
+-- Continue the sequence after the highest copied id, in case rows were ever
+-- inserted with explicit ids past it.
+SELECT setval(
+    'new_table_id_seq',
+    GREATEST(
+        (SELECT MAX(id) FROM new_table),
+        (SELECT last_value FROM new_table_id_seq)
+    )
+);
+
+-- Created on the parent so every partition gets its own local index.
+CREATE INDEX new_table_account_id_date_idx
+    ON new_table (account_id, "date" DESC)
+    INCLUDE (amount, transaction_type, category, currency);
+
+ANALYZE new_table;
+
+COMMIT;
@@ -0,0 +1,131 @@
+import asyncio
+from types import SimpleNamespace
+
+import orjson
+from openai.types.chat import ChatCompletion
+
+from app.functions import batch_caller
+from app.functions.batch_caller import batch_openai_function_call, submit_batch
+
+
+def _jsonl(records):
+    return "\n".join(orjson.dumps(record).decode() for record in records)
+
+
+def _completion(message):
+    return {
+        "id": "chatcmpl-test",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "test",
+        "choices": [{"index": 0, "finish_reason": "stop", "message": message}],
+    }
+
+
+class FakeClient:
+    """
+    Stands in for the OpenAI client: answers each batch with the records that
+    `respond` builds for its requests, split across output and error files.
+    """
+
+    def __init__(self, respond):
+        self.respond = respond
+        self.files_by_id = {}
+        self.files = SimpleNamespace(create=self._create_file, content=self._content)
+        self.batches = SimpleNamespace(
+            create=self._create_batch, retrieve=self._retrieve
+        )
+
+    def _store(self, data):
+        file_id = f"file-{len(self.files_by_id)}"
+        self.files_by_id[file_id] = data
+        return file_id
+
+    async def _create_file(self, file, purpose):
+        return SimpleNamespace(id=self._store(file[1].decode()))
+
+    async def _content(self, file_id):
+        return SimpleNamespace(text=self.files_by_id[file_id])
+
+    async def _create_batch(self, input_file_id, endpoint, completion_window):
+        lines = self.files_by_id[input_file_id].splitlines()
+        output, errors = self.respond([orjson.loads(line) for line in lines])
+        self.batch = SimpleNamespace(
+            id="batch-test",
+            status="completed",
+            output_file_id=self._store(_jsonl(output)),
+            error_file_id=self._store(_jsonl(errors)) if errors else None,
+        )
+        return SimpleNamespace(id=self.batch.id, status="in_progress")
+
+    async def _retrieve(self, batch_id):
+        return self.batch
+
+
+def test_submit_batch(monkeypatch):
+    def respond(requests):
+        ok, bad, failed = requests
+        # Output records come back out of order
+        output = [
+            {
+                "custom_id": bad["custom_id"],
+                "response": {"status_code": 400, "body": {"error": {"message": "bad"}}},
+                "error": None,
+            },
+            {
+                "custom_id": ok["custom_id"],
+                "response": {
+                    "status_code": 200,
+                    "body": _completion({"role": "assistant", "content": "first"}),
+                },
+                "error": None,
+            },
+        ]
+        errors = [
+            {
+                "custom_id": failed["custom_id"],
+                "response": None,
+                "error": {"code": "server_error", "message": "failed"},
+            }
+        ]
+        return output, errors
+
+    monkeypatch.setattr(batch_caller, "client", FakeClient(respond))
+    results = asyncio.run(submit_batch([{"n": 0}, {"n": 1}, {"n": 2}], poll_interval=0))
+
+    assert isinstance(results[0], ChatCompletion)
+    assert results[0].choices[0].message.content == "first"
+    assert isinstance(results[1], Exception) and "bad" in str(results[1])
+    assert isinstance(results[2], Exception) and "failed" in str(results[2])
+
+
+def test_batch_unknown_function(monkeypatch):
+    def message(request):
+        if request["body"]["messages"][-1]["content"] != "bad":
+            return {"role": "assistant", "content": "hello"}
+        tool_call = {
+            "id": "call-test",
+            "type": "function",
+            "function": {"name": "non_existent_function", "arguments": "{}"},
+        }
+        return {"role": "assistant", "content": None, "tool_calls": [tool_call]}
+
+    def respond(requests):
+        output = [
+            {
+                "custom_id": request["custom_id"],
+                "response": {"status_code": 200, "body": _completion(message(request))},
+                "error": None,
+            }
+            for request in requests
+        ]
+        return output, []
+
+    monkeypatch.setattr(batch_caller, "client", FakeClient(respond))
+    responses = asyncio.run(
+        batch_openai_function_call([("bad", "acc"), ("hi", "acc")], poll_interval=0)
+    )
+
+    # The unknown function fails only its own query
+    assert "error" in responses[0]
+    assert responses[1] == {"nl_response": "hello"}
@@ -0,0 +1,74 @@
+import time
+
+from app.functions.cache import SemanticCache
+
+
+def test_lookup_returns_similar_query_response():
+    cache = SemanticCache(threshold=0.95, ttl=60)
+    cache.store("account-1", [1.0, 0.0, 0.0], "You have 100 NGN.")
+
+    # Same direction, different magnitude
+    assert cache.lookup("account-1", [2.0, 0.0, 0.0]) == "You have 100 NGN."
+
+    # Dissimilar query misses
+    assert cache.lookup("account-1", [0.0, 1.0, 0.0]) is None
+
+
+def test_lookup_is_scoped_to_account():
+    cache = SemanticCache(threshold=0.95, ttl=60)
+    cache.store("account-1", [1.0, 0.0], "You have 100 NGN.")
+
+    assert cache.lookup("account-2", [1.0, 0.0]) is None
+
+
+def test_entries_expire_after_ttl():
+    cache = SemanticCache(threshold=0.95, ttl=0.01)
+    cache.store("account-1", [1.0, 0.0], "You have 100 NGN.")
+
+    time.sleep(0.02)
+
+    assert cache.lookup("account-1", [1.0, 0.0]) is None
+
+
+def test_store_keeps_newest_entries():
+    cache = SemanticCache(threshold=0.95, ttl=60, max_entries_per_account=2)
+    cache.store("account-1", [1.0, 0.0, 0.0], "first")
+    cache.store("account-1", [0.0, 1.0, 0.0], "second")
+    cache.store("account-1", [0.0, 0.0, 1.0], "third")
+
+    assert cache.lookup("account-1", [1.0, 0.0, 0.0]) is None
+    assert cache.lookup("account-1", [0.0, 1.0, 0.0]) == "second"
+    assert cache.lookup("account-1", [0.0, 0.0, 1.0]) == "third"
+
+    # With room for a single entry, each store replaces the previous one
+    cache = SemanticCache(threshold=0.95, ttl=60, max_entries_per_account=1)
+    cache.store("account-1", [1.0, 0.0, 0.0], "first")
+    cache.store("account-1", [0.0, 1.0, 0.0], "second")
+
+    assert cache.lookup("account-1", [1.0, 0.0, 0.0]) is None
+    assert cache.lookup("account-1", [0.0, 1.0, 0.0]) == "second"
+
+
+def test_store_bounds_number_of_accounts():
+    cache = SemanticCache(threshold=0.95, ttl=60, max_accounts=2)
+    cache.store("account-1", [1.0, 0.0], "one")
+    cache.store("account-2", [1.0, 0.0], "two")
+    cache.store("account-3", [1.0, 0.0], "three")
+
+    # The least recently used account is dropped
+    assert cache.lookup("account-1", [1.0, 0.0]) is None
+    assert cache.lookup("account-2", [1.0, 0.0]) == "two"
+    assert cache.lookup("account-3", [1.0, 0.0]) == "three"
+
+
+def test_clear():
+    cache = SemanticCache(threshold=0.95, ttl=60)
+    cache.store("account-1", [1.0, 0.0], "one")
+    cache.store("account-2", [1.0, 0.0], "two")
+
+    cache.clear("account-1")
+    assert cache.lookup("account-1", [1.0, 0.0]) is None
+    assert cache.lookup("account-2", [1.0, 0.0]) == "two"
+
+    cache.clear()
+    assert cache.lookup("account-2", [1.0, 0.0]) is None
@@ -0,0 +1,149 @@
+import json
+from decimal import Decimal
+from os import getenv
+from types import SimpleNamespace
+
+import httpx
+import openai
+import pytest
+from openai.types.chat import ChatCompletion, ChatCompletionChunk
+
+from app.database.execute_sql import close_pool
+from app.functions import function_caller
+
+
+@pytest.fixture(scope="session", autouse=True)
+def db_pool():
+    """
+    Every test shares the application's connection pool, which opens its
+    connections on the first query; close them once the whole session is done.
+    """
+    yield
+    close_pool()
+
+
+@pytest.fixture(scope="session")
+def test_id():
+    """
+    The account ID the database tests run against, from the TEST_ID environment
+    variable (app.config loads .env). Tests using it are skipped when it is unset.
+    """
+    account_id = getenv("TEST_ID")
+    if not account_id:
+        pytest.skip("TEST_ID not set")
+    return account_id
+
+
+class FakeOpenAI:
+    """
+    Stands in for the OpenAI client used by app.functions.function_caller. The
+    tool-selection completion answers with `router_message`, the summary with
+    `summary` (streamed in `summary_chunks` when stream=True) and embeddings
+    with `embedding`. Setting one of the *_error attributes makes that call
+    raise it instead. Every call is recorded in `requests`.
+    """
+
+    def __init__(self):
+        self.router_message = {"role": "assistant", "content": "Direct answer."}
+        self.summary = "Summary."
+        self.summary_chunks = ["Sum", "mary."]
+        self.embedding = [1.0, 0.0]
+        self.router_error: Exception | None = None
+        self.summary_error: Exception | None = None
+        self.embedding_error: Exception | None = None
+        self.requests = []
+        self.chat = SimpleNamespace(
+            completions=SimpleNamespace(create=self._complete)
+        )
+        self.embeddings = SimpleNamespace(create=self._embed)
+
+    def call_tool(self, function_name: str, arguments: dict) -> None:
+        """Make tool selection answer with a single call to `function_name`."""
+        self.router_message = {
+            "role": "assistant",
+            "content": None,
+            "tool_calls": [
+                {
+                    "id": "call-test",
+                    "type": "function",
+                    "function": {
+                        "name": function_name,
+                        "arguments": json.dumps(arguments),
+                    },
+                }
+            ],
+        }
+
+    @staticmethod
+    def connection_error() -> openai.APIError:
+        """The openai.APIError raised when OpenAI cannot be reached."""
+        return openai.APIConnectionError(
+            request=httpx.Request("POST", "https://api.openai.com/v1")
+        )
+
+    async def _embed(self, **kwargs):
+        self.requests.append(("embedding", kwargs))
+        if self.embedding_error:
+            raise self.embedding_error
+        return SimpleNamespace(data=[SimpleNamespace(embedding=self.embedding)])
+
+    async def _complete(self, **kwargs):
+        if "tools" in kwargs:
+            self.requests.append(("router", kwargs))
+            if self.router_error:
+                raise self.router_error
+            return _completion(self.router_message)
+
+        self.requests.append(("summary", kwargs))
+        if self.summary_error:
+            raise self.summary_error
+        if kwargs.get("stream"):
+            return self._stream()
+        return _completion({"role": "assistant", "content": self.summary})
+
+    async def _stream(self):
+        for content in self.summary_chunks:
+            yield ChatCompletionChunk.model_validate(
+                {
+                    "id": "chatcmpl-test",
+                    "object": "chat.completion.chunk",
+                    "created": 0,
+                    "model": "test",
+                    "choices": [{"index": 0, "delta": {"content": content}}],
+                }
+            )
+
+
+def _completion(message):
+    return ChatCompletion.model_validate(
+        {
+            "id": "chatcmpl-test",
+            "object": "chat.completion",
+            "created": 0,
+            "model": "test",
+            "choices": [{"index": 0, "finish_reason": "stop", "message": message}],
+        }
+    )
+
+
+@pytest.fixture
+def fake_openai(monkeypatch):
+    """Answer OpenAI calls with a FakeOpenAI, starting from an empty response cache."""
+    fake = FakeOpenAI()
+    monkeypatch.setattr(function_caller, "client", fake)
+    function_caller.response_cache.clear()
+    yield fake
+    function_caller.response_cache.clear()
+
+
+@pytest.fixture
+def transaction_rows(monkeypatch):
+    """Answer every tool call with two transaction rows, without the database."""
+    rows = [
+        {"amount": Decimal("10"), "currency": "NGN"},
+        {"amount": Decimal("20"), "currency": "NGN"},
+    ]
+    monkeypatch.setattr(
+        function_caller, "dispatch_function_calls", lambda calls: [rows] * len(calls)
+    )
+    return rows
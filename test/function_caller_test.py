@@ -1,16 +1,32 @@
+import asyncio
+import inspect
+import json
+from types import MappingProxyType, SimpleNamespace
+from typing import get_type_hints
+from datetime import datetime, timedelta
+from decimal import Decimal
+
 import pytest
-from os import getenv
+from fastapi import HTTPException
 
+from app.database.execute_sql import DEFERRED_RESULT, defer_sql
+from app.database.sql_queries import get_current_balance
+from app.functions import function_caller
 from app.functions.function_caller import (
+    FUNCTION_MAP,
     call_function_by_name,
+    call_functions_by_name,
+    dispatch_function_calls,
+    openai_function_call,
+    response_cache,
+    function_cache,
     generate_function_schema,
     generate_functions_list,
+    serialize_result,
+    template_response,
+    warm_up,
 )
 
-ID = getenv("TEST_ID")
-if not ID:
-    pytest.skip("TEST_ID not set", allow_module_level=True)
-
 
 def test_generate_function_schema():
     # Test with a simple function
@@ -30,12 +46,31 @@ def test_generate_function_schema():
     properties = schema["properties"]
     assert "param1" in properties
     assert "param2" in properties
+    assert properties["param1"]["type"] == "string"
+    assert properties["param2"]["type"] == "integer"
+    assert properties["param2"]["default"] == 10
 
     # Check required fields
     assert "param1" in schema["required"]
     assert "param2" not in schema["required"]  # Because it has a default value
 
 
+def test_generate_function_schema_optional_and_keyword_only():
+    def sample_function(
+        param1: float, param2: str | None = None, *, param3: bool = True
+    ):
+        pass
+
+    schema = generate_function_schema(sample_function)
+    properties = schema["properties"]
+
+    assert list(properties) == ["param1", "param2", "param3"]
+    assert properties["param1"] == {"type": "number"}
+    assert properties["param2"] == {"type": "string"}
+    assert properties["param3"] == {"type": "boolean", "default": True}
+    assert schema["required"] == ["param1"]
+
+
 def test_generate_functions_list():
     functions_list = generate_functions_list()
 
@@ -56,10 +91,25 @@ def test_generate_functions_list():
     assert "parameters" in function_props
 
 
-def test_call_function_by_name():
+def test_functions_list_is_plain_json():
+    functions_list = generate_functions_list()
+
+    # Built once at import and reused for every request
+    assert generate_functions_list() is functions_list
+
+    # The definitions are plain JSON data: they survive a round trip unchanged
+    assert json.loads(json.dumps(functions_list)) == functions_list
+
+    json_types = {"string", "number", "integer", "boolean"}
+    for function in functions_list:
+        for schema in function["function"]["parameters"]["properties"].values():
+            assert schema["type"] in json_types
+
+
+def test_call_function_by_name(test_id):
     # Test with a valid function
     function_name = "get_current_balance"
-    arguments = {"account_id": ID}
+    arguments = {"account_id": test_id}
 
     result = call_function_by_name(function_name, arguments)
 
@@ -69,3 +119,360 @@ def test_call_function_by_name():
     # Test with invalid function name
     with pytest.raises(ValueError):
         call_function_by_name("non_existent_function", {})
+
+
+def test_call_functions_by_name(test_id):
+    # Test with a batch of valid functions
+    calls = [
+        ("get_current_balance", {"account_id": test_id}),
+        ("get_recent_transactions", {"account_id": test_id}),
+    ]
+
+    results = call_functions_by_name(calls)
+
+    # One result per call, in order
+    assert len(results) == len(calls)
+    assert results[0] == call_function_by_name(*calls[0])
+    assert isinstance(results[1], list)
+
+    # Invalid arguments only affect their own call
+    results = call_functions_by_name(
+        [("get_current_balance", {"account_id": test_id, "unknown": 1}), calls[0]]
+    )
+    assert "error" in results[0]
+    assert isinstance(results[1], list)
+
+
+def test_function_map_is_batchable():
+    # call_functions_by_name batches a function only when it returns the rows
+    # of its single query unchanged; keep every FUNCTION_MAP entry that way
+    dummy_values = {str: "x", int: 1, float: 1.0}
+    for function_name, function in FUNCTION_MAP.items():
+        hints = get_type_hints(function)
+        arguments = {
+            name: dummy_values[hints[name]]
+            for name, parameter in inspect.signature(function).parameters.items()
+            if parameter.default is inspect.Parameter.empty
+        }
+
+        with defer_sql() as deferred:
+            returned = function(**arguments)
+
+        assert len(deferred) == 1, function_name
+        assert returned is DEFERRED_RESULT, function_name
+
+
+def test_call_functions_by_name_unbatchable_function(test_id, monkeypatch):
+    def count_balances(account_id: str):
+        return len(get_current_balance(account_id))
+
+    monkeypatch.setattr(
+        function_caller,
+        "FUNCTION_MAP",
+        MappingProxyType({**FUNCTION_MAP, "count_balances": count_balances}),
+    )
+    function_cache.clear()
+    calls = [
+        ("count_balances", {"account_id": test_id}),
+        ("get_current_balance", {"account_id": test_id}),
+    ]
+
+    # The post-processed result is kept rather than replaced by the raw rows
+    results = call_functions_by_name(calls)
+    assert results == [len(results[1]), get_current_balance(test_id)]
+    function_cache.clear()
+
+
+def test_function_cache(test_id):
+    function_cache.clear()
+    arguments = {"account_id": test_id}
+
+    # Repeat calls are served from the cache, batched or not
+    result = call_function_by_name("get_current_balance", arguments)
+    assert call_function_by_name("get_current_balance", dict(arguments)) is result
+    assert call_functions_by_name([("get_current_balance", arguments)])[0] is result
+
+    # Errors are not cached
+    call_function_by_name("get_current_balance", {"unknown": 1})
+    assert len(function_cache) == 1
+
+
+def test_function_cache_unhashable_arguments(test_id):
+    # Lists or objects from the model come back as error results, not exceptions
+    arguments = {"category": ["transfer"], "account_id": test_id}
+
+    result = call_function_by_name("get_transactions_by_category", arguments)
+    assert isinstance(result, (dict, list))
+    assert call_functions_by_name([("get_transactions_by_category", arguments)]) == [
+        result
+    ]
+
+
+@pytest.fixture
+def batched_calls(monkeypatch):
+    """
+    Replace call_functions_by_name for dispatch_function_calls: record each batch
+    and answer get_multi_facet_sums with one row per facet, other calls with
+    their function name.
+    """
+    batches = []
+
+    def fake_call_functions_by_name(calls):
+        batches.append(calls)
+        results = []
+        for function_name, arguments in calls:
+            if function_name == "get_multi_facet_sums":
+                results.append(
+                    [
+                        {"facet": facet, "total_amount": Decimal("1")}
+                        for facet in arguments
+                        if facet != "account_id" and arguments[facet] is not None
+                    ]
+                    + [{"facet": "account_id", "total_amount": Decimal("2")}]
+                )
+            else:
+                results.append(function_name)
+        return results
+
+    monkeypatch.setattr(
+        function_caller, "call_functions_by_name", fake_call_functions_by_name
+    )
+    return batches
+
+
+def test_dispatch_merges_facets(batched_calls):
+    calls = [
+        ("get_transactions_by_bank_name", {"bank_name": "GTBank", "account_id": "a"}),
+        ("get_current_balance", {"account_id": "a"}),
+        ("get_transactions_by_category", {"category": "food", "account_id": "a"}),
+    ]
+
+    results = dispatch_function_calls(calls)
+
+    # The facets share one query; the other call runs in the same batch
+    [batch] = batched_calls
+    assert batch == [
+        (
+            "get_multi_facet_sums",
+            {"account_id": "a", "bank_name": "GTBank", "category": "food"},
+        ),
+        calls[1],
+    ]
+
+    # Each facet call receives only its own rows, in call order
+    assert results[0] == [{"facet": "bank_name", "total_amount": Decimal("1")}]
+    assert results[1] == "get_current_balance"
+    assert results[2] == [{"facet": "category", "total_amount": Decimal("1")}]
+
+
+def test_dispatch_propagates_merged_error(monkeypatch):
+    def failing_call_functions_by_name(calls):
+        return [{"error": "boom"}] + [name for name, _ in calls[1:]]
+
+    monkeypatch.setattr(
+        function_caller, "call_functions_by_name", failing_call_functions_by_name
+    )
+    calls = [
+        ("get_transactions_by_bank_name", {"bank_name": "GTBank", "account_id": "a"}),
+        ("get_transactions_by_category", {"category": "food", "account_id": "a"}),
+        ("get_current_balance", {"account_id": "a"}),
+    ]
+
+    results = dispatch_function_calls(calls)
+
+    assert results == [{"error": "boom"}, {"error": "boom"}, "get_current_balance"]
+
+
+def test_dispatch_duplicate_facet_runs_separately(batched_calls):
+    calls = [
+        ("get_transactions_by_category", {"category": "food", "account_id": "a"}),
+        ("get_transactions_by_bank_name", {"bank_name": "GTBank", "account_id": "a"}),
+        ("get_transactions_by_category", {"category": "rent", "account_id": "a"}),
+    ]
+
+    results = dispatch_function_calls(calls)
+
+    # Only the first call per facet is merged; the repeat runs on its own
+    [batch] = batched_calls
+    assert batch[0][0] == "get_multi_facet_sums"
+    assert batch[0][1]["category"] == "food"
+    assert batch[1:] == [calls[2]]
+    assert results[0] == [{"facet": "category", "total_amount": Decimal("1")}]
+    assert results[1] == [{"facet": "bank_name", "total_amount": Decimal("1")}]
+    assert results[2] == "get_transactions_by_category"
+
+
+def test_dispatch_single_facet_is_not_merged(batched_calls):
+    calls = [
+        ("get_transactions_by_category", {"category": "food", "account_id": "a"}),
+        ("get_transactions_by_category", {"category": "rent", "account_id": "a"}),
+        ("get_current_balance", {"account_id": "a"}),
+    ]
+
+    results = dispatch_function_calls(calls)
+
+    assert batched_calls == [calls]
+    assert results == [
+        "get_transactions_by_category",
+        "get_transactions_by_category",
+        "get_current_balance",
+    ]
+
+
+def test_serialize_result():
+    # Small results are passed through unchanged
+    balance = [{"balance_after": Decimal("100.50"), "currency": "NGN"}]
+    assert json.loads(serialize_result(balance)) == [
+        {"balance_after": "100.50", "currency": "NGN"}
+    ]
+
+    # Long transaction lists are replaced by their aggregates
+    transactions = [
+        {
+            "amount": Decimal("10"),
+            "transaction_type": "credit" if i % 2 else "debit",
+            "category": "food" if i % 3 else "transfer",
+            "currency": "NGN",
+        }
+        for i in range(50)
+    ]
+    summary = json.loads(serialize_result(transactions))
+    assert summary["count"] == 50
+    assert summary["totals"]["NGN"]["total_credit"] == "250"
+    assert summary["totals"]["NGN"]["total_debit"] == "250"
+    assert summary["totals"]["NGN"]["top_categories"][0][0] == "food"
+    assert len(summary["sample"]) == 5
+
+    # Amounts in different currencies are totalled separately
+    for i, transaction in enumerate(transactions):
+        transaction["currency"] = "USD" if i < 10 else "NGN"
+    totals = json.loads(serialize_result(transactions))["totals"]
+    assert totals["USD"]["total_credit"] == "50"
+    assert totals["USD"]["total_debit"] == "50"
+    assert totals["NGN"]["total_credit"] == "200"
+    assert totals["NGN"]["total_debit"] == "200"
+    assert "next_cursor" not in json.loads(serialize_result(transactions))
+
+    # A truncated page says how many rows match and where the next page starts
+    newest = datetime(2024, 3, 1)
+    for i, transaction in enumerate(transactions):
+        transaction.update(date=newest - timedelta(days=i), id=i, total_rows=120)
+    summary = json.loads(serialize_result(transactions))
+    assert summary["count"] == 50
+    assert summary["total_rows"] == 120
+    assert summary["next_cursor"] == {
+        "before": (newest - timedelta(days=49)).isoformat(),
+        "before_id": 49,
+    }
+
+
+def test_template_response():
+    balance_call = [("get_current_balance", {})]
+    balance = [{"balance_after": Decimal("1234.5"), "currency": "NGN"}]
+    assert (
+        template_response(balance_call, [balance])
+        == "You currently have NGN 1,234.50 available."
+    )
+
+    # Empty results are answered without a summary; errors and lists are not
+    assert (
+        template_response(balance_call, [[]])
+        == "No transactions found for that query."
+    )
+    assert template_response(balance_call, [{"error": "boom"}]) is None
+    assert (
+        template_response(balance_call, [[{"balance_after": None, "currency": "NGN"}]])
+        is None
+    )
+    assert (
+        template_response(balance_call, [[{"balance_after": 5, "currency": None}]])
+        == "You currently have 5.00 available."
+    )
+    assert template_response([("get_deposits", {})], [[{"total": 1}]]) is None
+    assert template_response(balance_call * 2, [balance, balance]) is None
+
+
+def test_embedding_failure_skips_response_cache(fake_openai, transaction_rows):
+    fake_openai.call_tool("get_transactions_by_category", {"category": "food"})
+    routing_started = []
+
+    async def failing_embedding(**kwargs):
+        # Give tool selection the chance to start before this call fails
+        for _ in range(10):
+            await asyncio.sleep(0)
+        kinds = [kind for kind, _ in fake_openai.requests]
+        routing_started.append("router" in kinds)
+        raise fake_openai.connection_error()
+
+    fake_openai.embeddings.create = failing_embedding
+
+    # The query is still answered, just not cached
+    result = asyncio.run(openai_function_call("food spending", "account-1"))
+    assert result == {"nl_response": "Summary."}
+    assert response_cache.lookup("account-1", fake_openai.embedding) is None
+
+    # The embedding is requested alongside tool selection, not before it
+    assert routing_started == [True]
+
+
+def test_openai_function_call_short_circuits(fake_openai, monkeypatch):
+    # A cached answer for a similar query is returned without any completion
+    response_cache.store("account-1", fake_openai.embedding, "Cached answer.")
+    result = asyncio.run(openai_function_call("my balance?", "account-1"))
+    assert result == {"nl_response": "Cached answer."}
+    assert "summary" not in [kind for kind, _ in fake_openai.requests]
+
+    # A lone balance lookup is templated instead of summarized
+    response_cache.clear()
+    balance = [{"balance_after": Decimal("1234.5"), "currency": "NGN"}]
+    monkeypatch.setattr(
+        function_caller, "dispatch_function_calls", lambda calls: [balance]
+    )
+    fake_openai.call_tool("get_current_balance", {})
+    result = asyncio.run(openai_function_call("my balance?", "account-1"))
+    assert result == {"nl_response": "You currently have NGN 1,234.50 available."}
+    assert "summary" not in [kind for kind, _ in fake_openai.requests]
+
+
+def test_openai_function_call_errors(fake_openai, transaction_rows):
+    fake_openai.call_tool("get_transactions_by_category", {"category": "food"})
+
+    # OpenAI API errors from either completion become a 502
+    for attribute in ("router_error", "summary_error"):
+        setattr(fake_openai, attribute, fake_openai.connection_error())
+        with pytest.raises(HTTPException) as excinfo:
+            asyncio.run(openai_function_call("food spending", "account-1"))
+        assert excinfo.value.status_code == 502
+        assert excinfo.value.detail == "Connection error."
+        setattr(fake_openai, attribute, None)
+
+    # Anything else is raised unchanged
+    error = RuntimeError("boom")
+    fake_openai.router_error = error
+    with pytest.raises(RuntimeError) as excinfo:
+        asyncio.run(openai_function_call("food spending", "account-1"))
+    assert excinfo.value is error
+
+
+def test_warm_up_gives_up_quickly(fake_openai, monkeypatch):
+    options = []
+    waits = []
+
+    async def unreachable():
+        raise fake_openai.connection_error()
+
+    def with_options(**kwargs):
+        options.append(kwargs)
+        return SimpleNamespace(models=SimpleNamespace(list=unreachable))
+
+    def wait(timeout):
+        waits.append(timeout)
+        raise TimeoutError("pool initialization incomplete")
+
+    fake_openai.with_options = with_options
+    monkeypatch.setattr(function_caller, "get_pool", lambda: SimpleNamespace(wait=wait))
+
+    # Both steps are bounded by WARM_UP_TIMEOUT, and their failures are logged
+    asyncio.run(warm_up())
+    assert options == [{"max_retries": 0, "timeout": function_caller.WARM_UP_TIMEOUT}]
+    assert waits == [function_caller.WARM_UP_TIMEOUT]
@@ -0,0 +1,57 @@
+import asyncio
+
+from fastapi import HTTPException
+
+from app.functions import parallel
+from app.functions.parallel import batch_query
+from app.schema.user import UserQuery
+
+
+def _queries(*texts):
+    return [UserQuery(query=text, account_id="account-1") for text in texts]
+
+
+def test_batch_query_returns_per_query_errors(monkeypatch):
+    async def fake_openai_function_call(user_query, account_id):
+        if user_query == "boom":
+            raise Exception("model unavailable")
+        if user_query == "bad gateway":
+            raise HTTPException(status_code=502, detail="upstream error")
+        return {"nl_response": f"answer to {user_query}"}
+
+    monkeypatch.setattr(parallel, "_semaphore", asyncio.Semaphore(2))
+    monkeypatch.setattr(parallel, "openai_function_call", fake_openai_function_call)
+
+    responses = asyncio.run(batch_query(_queries("one", "boom", "bad gateway")))
+
+    # One failing query does not lose the other answers
+    assert responses[0].nl_response == "answer to one"
+    assert responses[0].error is None
+    assert responses[1].nl_response is None
+    assert responses[1].error == "model unavailable"
+    assert responses[2].error == "upstream error"
+
+
+def test_batch_query_concurrency_is_shared_across_batches(monkeypatch):
+    running = 0
+    peak = 0
+
+    async def fake_openai_function_call(user_query, account_id):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return {"nl_response": user_query}
+
+    async def two_batches():
+        monkeypatch.setattr(parallel, "_semaphore", asyncio.Semaphore(2))
+        return await asyncio.gather(
+            batch_query(_queries("a", "b", "c")), batch_query(_queries("d", "e", "f"))
+        )
+
+    monkeypatch.setattr(parallel, "openai_function_call", fake_openai_function_call)
+    first, second = asyncio.run(two_batches())
+
+    assert [response.nl_response for response in first + second] == list("abcdef")
+    assert peak == 2
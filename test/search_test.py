@@ -0,0 +1,69 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.v1.search import _server_sent_event
+from app.functions.function_caller import response_cache
+from app.main import app
+
+
+@pytest.fixture
+def api():
+    # Not used as a context manager, so the lifespan (warm-up) does not run
+    return TestClient(app)
+
+
+def test_ai_search_errors(api, fake_openai):
+    body = {"query": "food spending", "account_id": "account-1"}
+
+    fake_openai.router_error = fake_openai.connection_error()
+    response = api.post("/api/v1/ai-search", json=body)
+    assert response.status_code == 502
+    assert response.json() == {"detail": "Connection error."}
+
+    # Other errors are not mapped to 502
+    fake_openai.router_error = RuntimeError("boom")
+    response = api.post("/api/v1/ai-search", json=body)
+    assert response.status_code == 500
+    assert response.json() == {"detail": "boom"}
+
+
+def test_server_sent_event():
+    assert _server_sent_event("You have") == "data: You have\n\n"
+
+    # Every line of a multi-line chunk gets its own data field
+    assert _server_sent_event("one\ntwo") == "data: one\ndata: two\n\n"
+    assert _server_sent_event("") == "data: \n\n"
+
+
+def test_stream_summary(api, fake_openai, transaction_rows):
+    fake_openai.call_tool("get_transactions_by_category", {"category": "food"})
+    body = {"query": "food spending", "account_id": "account-1"}
+
+    response = api.post("/api/v1/ai-search/stream", json=body)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.text == "data: Sum\n\ndata: mary.\n\n"
+
+    # The streamed answer is cached once the stream has finished
+    assert response_cache.lookup("account-1", fake_openai.embedding) == "Summary."
+
+    # A repeat query is answered from the cache without a summary completion
+    response = api.post("/api/v1/ai-search/stream", json=body)
+    assert response.text == "data: Summary.\n\n"
+    assert [kind for kind, _ in fake_openai.requests].count("summary") == 1
+
+
+def test_stream_errors_before_first_chunk(api, fake_openai):
+    body = {"query": "food spending", "account_id": "account-1"}
+
+    # Errors raised before the first chunk become a status code, not a broken stream
+    fake_openai.router_error = fake_openai.connection_error()
+    response = api.post("/api/v1/ai-search/stream", json=body)
+    assert response.status_code == 502
+    assert response.json() == {"detail": "Connection error."}
+
+    fake_openai.router_error = RuntimeError("boom")
+    response = api.post("/api/v1/ai-search/stream", json=body)
+    assert response.status_code == 500
+    assert response.json() == {"detail": "boom"}
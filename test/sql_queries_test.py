@@ -1,13 +1,14 @@
-import decimal
-from os import getenv
+import re
+from decimal import Decimal
 
-from dotenv import load_dotenv
+import pytest
 
-from app.database.execute_sql import execute_sql
+from app.database.execute_sql import defer_sql, execute_sql, execute_sql_batch
 from app.database.sql_queries import (
     get_all_transactions,
     get_current_balance,
     get_deposits,
+    get_multi_facet_sums,
     get_recent_transactions,
     get_transactions_below,
     get_transactions_between_amounts_and_category,
@@ -16,6 +17,7 @@ from app.database.sql_queries import (
     get_transactions_by_bank_name,
     get_transactions_by_category,
     get_transactions_by_date,
+    get_transactions_by_keyword,
     get_transactions_created_last_week,
     get_transactions_last_month,
     get_transactions_over,
@@ -24,12 +26,225 @@ from app.database.sql_queries import (
     get_withdrawals_over_last_days,
 )
 
-load_dotenv()
+_NUMERIC = (int, float, Decimal)
+_EPS = Decimal("0.01")
+
+# Fields each summary query must return
+_EXPECTED_ALL_TRANSACTIONS = frozenset(
+    {
+        "total_amount",
+        "total_credit",
+        "total_debit",
+        "highest_credit_category",
+        "highest_credit_amount",
+        "highest_debit_category",
+        "highest_debit_amount",
+    }
+)
+_EXPECTED_LAST_MONTH = frozenset(
+    {
+        "total_transactions_last_month",
+        "total_received",
+        "total_spent",
+        "highest_spent_category",
+        "highest_spent_amount",
+    }
+)
+_EXPECTED_DEPOSITS = frozenset(
+    {
+        "total_deposits",
+        "highest_deposit_category",
+        "highest_category_amount",
+    }
+)
+_EXPECTED_WITHDRAWALS = frozenset(
+    {
+        "total_withdrawals",
+        "highest_withdrawal_category",
+        "highest_category_amount",
+    }
+)
+_EXPECTED_CREATED_LAST_WEEK = frozenset(
+    {
+        "total_sum",
+        "total_spent",
+        "total_received",
+        "highest_spend_category",
+        "highest_spend_amount",
+    }
+)
+_EXPECTED_WITHDRAWALS_OVER_LAST_DAYS = frozenset(
+    {
+        "total_sum",
+        "total_spent",
+        "total_received",
+        "highest_spend_category",
+        "highest_category_amount",
+    }
+)
+_EXPECTED_UPDATED_SINCE = frozenset(
+    {
+        "total_sum",
+        "total_spent",
+        "total_received",
+        "highest_spend_category",
+        "highest_spend_amount",
+    }
+)
+_EXPECTED_BETWEEN_AMOUNTS_AND_CATEGORY = frozenset(
+    {
+        "total_sum",
+        "total_spent",
+        "total_received",
+        "highest_spend_category",
+        "highest_category_amount",
+    }
+)
+
+OVER_THRESHOLD = Decimal("1000.00")
+BELOW_THRESHOLD = Decimal("5000.00")
+
+_TRANSACTION_ROW_TYPES = {
+    "amount": _NUMERIC,
+    "category": str,
+    "transaction_type": str,
+    "bank_name": str,
+}
+
+# Per-currency sums for the whole account and for every category in one scan.
+# Not one of the tool functions: the test checks it against them.
+_ALL_SUMMARIES_QUERY = """
+    SELECT
+        CASE WHEN GROUPING(category) = 1 THEN 'account' ELSE 'category' END AS level,
+        category,
+        currency,
+        SUM(CASE WHEN transaction_type ILIKE '%%credit%%' THEN amount ELSE 0 END)
+            AS credit_amount,
+        SUM(CASE WHEN transaction_type ILIKE '%%debit%%' THEN amount ELSE 0 END)
+            AS debit_amount,
+        SUM(amount) AS total_amount
+    FROM new_table
+    WHERE account_id = %s
+    GROUP BY GROUPING SETS ((currency), (currency, category))
+    ORDER BY level, total_amount DESC;
+"""
+
+
+def _get_all_summaries(account_id):
+    return execute_sql(_ALL_SUMMARIES_QUERY, (account_id,))
+
+
+# Every query under test, called with the test account ID, keyed by function name
+QUERIES = {
+    "get_recent_transactions": get_recent_transactions,
+    "get_current_balance": get_current_balance,
+    "get_all_transactions": get_all_transactions,
+    "get_transactions_by_date": lambda account_id: get_transactions_by_date(
+        "2024-01-20", account_id
+    ),
+    "get_transactions_between_dates": lambda account_id: get_transactions_between_dates(
+        "2024-01-10", "2024-01-20", account_id
+    ),
+    "get_transactions_last_month": get_transactions_last_month,
+    "get_transactions_over": lambda account_id: get_transactions_over(
+        OVER_THRESHOLD, account_id
+    ),
+    "get_transactions_below": lambda account_id: get_transactions_below(
+        BELOW_THRESHOLD, account_id
+    ),
+    "get_deposits": get_deposits,
+    "get_withdrawals": get_withdrawals,
+    "get_transactions_by_category": lambda account_id: get_transactions_by_category(
+        "transfer", account_id
+    ),
+    "get_transactions_by_bank_name": lambda account_id: get_transactions_by_bank_name(
+        "GTBank", account_id
+    ),
+    "get_transactions_by_keyword": lambda account_id: get_transactions_by_keyword(
+        "transfer", account_id
+    ),
+    "get_transactions_created_last_week": get_transactions_created_last_week,
+    "get_withdrawals_over_last_days": lambda account_id: get_withdrawals_over_last_days(
+        100000.00, account_id, 50
+    ),
+    "get_transactions_updated_since": lambda account_id: get_transactions_updated_since(
+        "2024-02-01 00:00:00", account_id
+    ),
+    "get_transactions_between_amounts_and_category": lambda account_id: (
+        get_transactions_between_amounts_and_category(
+            100000.00, 1000000.00, "transfer", account_id
+        )
+    ),
+    "get_transactions_by_bank_and_category": lambda account_id: (
+        get_transactions_by_bank_and_category("GTBank", "transfer", account_id)
+    ),
+    "get_multi_facet_sums": lambda account_id: get_multi_facet_sums(
+        account_id, bank_name="GTBank", category="transfer"
+    ),
+    "get_all_summaries": _get_all_summaries,
+}
+
+# Every test needs the database, which is only configured when TEST_ID is set
+pytestmark = pytest.mark.usefixtures("test_id")
+
+
+class _Results(dict):
+    """Query results keyed by function name; a failed query raises its error."""
+
+    def __getitem__(self, name):
+        result = super().__getitem__(name)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+@pytest.fixture(scope="session")
+def all_results(test_id):
+    """
+    Run every query in QUERIES once, together in one batch over a single
+    connection, and return the results keyed by function name. The queries
+    scan a temporary copy of the test account's rows rather than the whole
+    table. If the batch fails, each query is run on its own so only the tests
+    of the failing query fail.
+    """
+    # Lives only for the batch's transaction
+    setup = [
+        ("CREATE TEMP TABLE tx_test (LIKE new_table) ON COMMIT DROP", None),
+        (
+            "INSERT INTO tx_test SELECT * FROM new_table WHERE account_id = %s",
+            (test_id,),
+        ),
+        ("ANALYZE tx_test", None),
+    ]
+
+    queries = {}
+    for name, query in QUERIES.items():
+        with defer_sql() as deferred:
+            query(test_id)
+        [(sql, params)] = deferred
+        queries[name] = (re.sub(r"\bnew_table\b", "tx_test", sql), params)
+
+    try:
+        results = execute_sql_batch(setup + list(queries.values()))
+    except Exception:
+        pass
+    else:
+        return _Results(zip(queries, results[len(setup) :]))
+
+    results = _Results()
+    for name, query in queries.items():
+        try:
+            results[name] = execute_sql_batch(setup + [query])[-1]
+        except Exception as e:
+            results[name] = e
+    return results
 
-ID = getenv("TEST_ID")
-if not ID:
-    import pytest
-    pytest.skip("TEST_ID not set", allow_module_level=True)
+
+def _assert_transaction_row(transaction):
+    """Check a row returned by one of the transaction list queries."""
+    assert _TRANSACTION_ROW_TYPES.keys() <= transaction.keys()
+    for field, expected_type in _TRANSACTION_ROW_TYPES.items():
+        assert isinstance(transaction[field], expected_type)
 
 
 def test_execute_sql():
@@ -39,8 +254,8 @@ def test_execute_sql():
     assert result[0]["exists"] is True
 
 
-def test_get_recent_transactions():
-    result = get_recent_transactions(ID)
+def test_get_recent_transactions(all_results):
+    result = all_results["get_recent_transactions"]
 
     # Basic assertions
     assert isinstance(result, list)  # Should return a list
@@ -57,35 +272,24 @@ def test_get_recent_transactions():
         assert "total_amount_of_3_transactions" in transaction
 
 
-def test_get_current_balance():
-    # Execute the function with test ID
-    result = get_current_balance(ID)
+def test_get_current_balance(all_results):
+    result = all_results["get_current_balance"]
 
     # Basic assertions
     assert isinstance(result, list)  # Should return a list
 
     balance_info = result[0]
     assert "balance_after" in balance_info
-    assert isinstance(balance_info["balance_after"], (int, float, decimal.Decimal))
+    assert isinstance(balance_info["balance_after"], _NUMERIC)
 
 
-def test_get_all_transactions():
-    result = get_all_transactions(ID)
+def test_get_all_transactions(all_results):
+    result = all_results["get_all_transactions"]
 
     assert isinstance(result, list)
 
     transaction_summary = result[0]
-    expected_fields = [
-        "total_amount",
-        "total_credit",
-        "total_debit",
-        "highest_credit_category",
-        "highest_credit_amount",
-        "highest_debit_category",
-        "highest_debit_amount",
-    ]
-    for field in expected_fields:
-        assert field in transaction_summary
+    assert _EXPECTED_ALL_TRANSACTIONS.issubset(transaction_summary)
 
     numeric_fields = [
         "total_amount",
@@ -94,69 +298,38 @@ def test_get_all_transactions():
         "highest_credit_amount",
         "highest_debit_amount",
     ]
-    for field in numeric_fields:
-        if transaction_summary[field] is not None:
-            assert isinstance(transaction_summary[field], (int, float, decimal.Decimal))
-
-
-def test_get_transactions_by_date():
-    date = "2024-01-20"
-    result = get_transactions_by_date(date, ID)
-
-    assert isinstance(result, list)
-
-    transaction = result[0]
-    expected_fields = ["amount", "category", "transaction_type", "bank_name"]
-    for field in expected_fields:
-        assert field in transaction
-
-    assert isinstance(transaction["amount"], (int, float, decimal.Decimal))
-    assert isinstance(transaction["category"], str)
-    assert isinstance(transaction["transaction_type"], str)
-    assert isinstance(transaction["bank_name"], str)
+    assert all(
+        isinstance(value, _NUMERIC)
+        for value in (transaction_summary[field] for field in numeric_fields)
+        if value is not None
+    )
 
 
-def test_get_transactions_between_dates():
-    start_date = "2024-01-10"
-    end_date = "2024-01-20"
-    result = get_transactions_between_dates(start_date, end_date, ID)
+@pytest.mark.parametrize(
+    "name",
+    [
+        "get_transactions_by_date",
+        "get_transactions_between_dates",
+        "get_transactions_over",
+        "get_transactions_below",
+    ],
+)
+def test_transaction_rows(all_results, name):
+    result = all_results[name]
 
     assert isinstance(result, list)
 
-    transaction = result[0]
-    expected_fields = [
-        "amount",
-        "category",
-        "transaction_type",
-        "bank_name",
-    ]
-    for field in expected_fields:
-        assert field in transaction
-
-    # Verify data types
-    assert isinstance(transaction["amount"], (int, float, decimal.Decimal))
-    assert isinstance(transaction["category"], str)
-    assert isinstance(transaction["transaction_type"], str)
-    assert isinstance(transaction["bank_name"], str)
+    _assert_transaction_row(result[0])
 
 
-def test_get_transactions_last_month():
-    # Execute function with test ID
-    result = get_transactions_last_month(ID)
+def test_get_transactions_last_month(all_results):
+    result = all_results["get_transactions_last_month"]
 
     # Basic assertions
     assert isinstance(result, list)
 
     monthly_summary = result[0]
-    expected_fields = [
-        "total_transactions_last_month",
-        "total_received",
-        "total_spent",
-        "highest_spent_category",
-        "highest_spent_amount",
-    ]
-    for field in expected_fields:
-        assert field in monthly_summary
+    assert _EXPECTED_LAST_MONTH.issubset(monthly_summary)
 
     # Verify numeric fields have correct type
     numeric_fields = [
@@ -165,119 +338,115 @@ def test_get_transactions_last_month():
         "total_spent",
         "highest_spent_amount",
     ]
-    for field in numeric_fields:
-        if monthly_summary[field] is not None:
-            assert isinstance(monthly_summary[field], (int, float, decimal.Decimal))
+    assert all(
+        isinstance(value, _NUMERIC)
+        for value in (monthly_summary[field] for field in numeric_fields)
+        if value is not None
+    )
 
-        # Verify category field is string if present
+    # Verify category field is string if present
     if monthly_summary["highest_spent_category"]:
         assert isinstance(monthly_summary["highest_spent_category"], str)
 
 
-def test_get_transactions_over():
-    # Test with a threshold amount
-    threshold = 1000.00
-    result = get_transactions_over(threshold, ID)
+def test_get_transactions_over(all_results):
+    transaction = all_results["get_transactions_over"][0]
 
-    # Basic assertions
-    assert isinstance(result, list)
+    # Verify amount is above threshold
+    assert transaction["amount"] > OVER_THRESHOLD
 
-    transaction = result[0]
-    expected_fields = ["amount", "category", "transaction_type", "bank_name"]
-    for field in expected_fields:
-        assert field in transaction
 
-    # Verify amount is above threshold
-    assert float(transaction["amount"]) > threshold
+def test_get_transactions_below(all_results):
+    transaction = all_results["get_transactions_below"][0]
 
-    # Verify data types
-    assert isinstance(transaction["amount"], (int, float, decimal.Decimal))
-    assert isinstance(transaction["category"], str)
-    assert isinstance(transaction["transaction_type"], str)
-    assert isinstance(transaction["bank_name"], str)
+    # Verify amount is below threshold
+    assert transaction["amount"] < BELOW_THRESHOLD
 
 
-def test_get_transactions_below():
-    # Test with a threshold amount
-    threshold = 5000.00
-    result = get_transactions_below(threshold, ID)
+def test_get_transactions_below_pagination(test_id):
+    # Test parameters
+    threshold = BELOW_THRESHOLD
+    page_size = 2
 
-    # Basic assertions
-    assert isinstance(result, list)
+    first_page = get_transactions_below(threshold, test_id, limit=page_size)
 
-    transaction = result[0]
-    expected_fields = ["amount", "category", "transaction_type", "bank_name"]
-    for field in expected_fields:
-        assert field in transaction
+    # Basic assertions
+    assert isinstance(first_page, list)
+    assert len(first_page) <= page_size
+
+    # Rows are returned newest first, ties broken by id
+    keys = [(transaction["date"], transaction["id"]) for transaction in first_page]
+    assert keys == sorted(keys, reverse=True)
+
+    # The next page starts strictly after the last row of the previous one,
+    # without skipping rows that share its date
+    if len(first_page) == page_size:
+        last = first_page[-1]
+        next_page = get_transactions_below(
+            threshold,
+            test_id,
+            limit=page_size,
+            before=str(last["date"]),
+            before_id=last["id"],
+        )
+        for transaction in next_page:
+            assert (transaction["date"], transaction["id"]) < keys[-1]
 
-    # Verify amount is below threshold
-    assert float(transaction["amount"]) < threshold
+    # Every row reports how many rows match in total, including later pages
+    if first_page:
+        assert first_page[0]["total_rows"] >= len(first_page)
 
-    # Verify data types
-    assert isinstance(transaction["amount"], (int, float, decimal.Decimal))
-    assert isinstance(transaction["category"], str)
-    assert isinstance(transaction["transaction_type"], str)
-    assert isinstance(transaction["bank_name"], str)
+    # Oversized pages are capped, and a non-positive limit still returns a page
+    assert len(get_transactions_below(threshold, test_id, limit=10_000)) <= 100
+    assert len(get_transactions_below(threshold, test_id, limit=-5)) <= 1
 
 
-def test_get_deposits():
-    # Execute function with test ID
-    result = get_deposits(ID)
+def test_get_deposits(all_results):
+    result = all_results["get_deposits"]
 
     # Basic assertions
     assert isinstance(result, list)
 
     deposit_summary = result[0]
-    expected_fields = [
-        "total_deposits",
-        "highest_deposit_category",
-        "highest_category_amount",
-    ]
-    for field in expected_fields:
-        assert field in deposit_summary
+    assert _EXPECTED_DEPOSITS.issubset(deposit_summary)
 
     # Verify numeric fields have correct type
     numeric_fields = ["total_deposits", "highest_category_amount"]
-    for field in numeric_fields:
-        if deposit_summary[field] is not None:
-            assert isinstance(deposit_summary[field], (int, float, decimal.Decimal))
+    assert all(
+        isinstance(value, _NUMERIC)
+        for value in (deposit_summary[field] for field in numeric_fields)
+        if value is not None
+    )
 
     # Verify category field is string if present
     if deposit_summary["highest_deposit_category"]:
         assert isinstance(deposit_summary["highest_deposit_category"], str)
 
 
-def test_get_withdrawals():
-    # Execute function with test ID
-    result = get_withdrawals(ID)
+def test_get_withdrawals(all_results):
+    result = all_results["get_withdrawals"]
 
     # Basic assertions
     assert isinstance(result, list)
 
     withdrawal_summary = result[0]
-    expected_fields = [
-        "total_withdrawals",
-        "highest_withdrawal_category",
-        "highest_category_amount",
-    ]
-    for field in expected_fields:
-        assert field in withdrawal_summary
+    assert _EXPECTED_WITHDRAWALS.issubset(withdrawal_summary)
 
     # Verify numeric fields have correct type
     numeric_fields = ["total_withdrawals", "highest_category_amount"]
-    for field in numeric_fields:
-        if withdrawal_summary[field] is not None:
-            assert isinstance(withdrawal_summary[field], (int, float, decimal.Decimal))
+    assert all(
+        isinstance(value, _NUMERIC)
+        for value in (withdrawal_summary[field] for field in numeric_fields)
+        if value is not None
+    )
 
     # Verify category field is string if present
     if withdrawal_summary["highest_withdrawal_category"]:
         assert isinstance(withdrawal_summary["highest_withdrawal_category"], str)
 
 
-def test_get_transactions_by_category():
-    # Test with a sample category
-    category = "transfer"
-    result = get_transactions_by_category(category, ID)
+def test_get_transactions_by_category(all_results):
+    result = all_results["get_transactions_by_category"]
 
     # Basic assertions
     assert isinstance(result, list)
@@ -290,24 +459,23 @@ def test_get_transactions_by_category():
         assert field in transaction_summary
 
     # Verify numeric fields have correct type
-    for field in expected_fields:
-        if transaction_summary[field] is not None:
-            assert isinstance(transaction_summary[field], (int, float, decimal.Decimal))
+    assert all(
+        isinstance(value, _NUMERIC)
+        for value in (transaction_summary[field] for field in expected_fields)
+        if value is not None
+    )
 
     # Verify total_amount equals credit_amount minus debit_amount
     if all(transaction_summary[field] is not None for field in expected_fields):
         expected_total = (
             transaction_summary["credit_amount"] + transaction_summary["debit_amount"]
         )
-        assert (
-            abs(transaction_summary["total_amount"] - expected_total) < 0.01
-        )  # Allow for small rounding differences
+        # Allow for small rounding differences
+        assert abs(transaction_summary["total_amount"] - expected_total) < _EPS
 
 
-def test_get_transactions_by_bank_name():
-    # Test with a sample bank name
-    bank_name = "GTBank"
-    result = get_transactions_by_bank_name(bank_name, ID)
+def test_get_transactions_by_bank_name(all_results):
+    result = all_results["get_transactions_by_bank_name"]
 
     # Basic assertions
     assert isinstance(result, list)
@@ -320,38 +488,42 @@ def test_get_transactions_by_bank_name():
         assert field in transaction_summary
 
     # Verify numeric fields have correct type
-    for field in expected_fields:
-        if transaction_summary[field] is not None:
-            assert isinstance(transaction_summary[field], (int, float, decimal.Decimal))
+    assert all(
+        isinstance(value, _NUMERIC)
+        for value in (transaction_summary[field] for field in expected_fields)
+        if value is not None
+    )
 
     # Verify total amount matches credit minus debit
     if all(transaction_summary[field] is not None for field in expected_fields):
         expected_total = (
             transaction_summary["credit_amount"] + transaction_summary["debit_amount"]
         )
-        assert abs(transaction_summary["total_amount"] - expected_total) < 0.01
+        assert abs(transaction_summary["total_amount"] - expected_total) < _EPS
 
 
-def test_get_transactions_created_last_week():
-    # Execute function with test ID
-    result = get_transactions_created_last_week(ID)
+def test_get_transactions_by_keyword(all_results):
+    result = all_results["get_transactions_by_keyword"]
 
     # Basic assertions
     assert isinstance(result, list)
 
+    # Column names do not depend on the keyword
     if result:
-        weekly_summary = result[0]
-        expected_fields = [
-            "total_sum",
-            "total_spent",
-            "total_received",
-            "highest_spend_category",
-            "highest_spend_amount",
-        ]
+        transaction_summary = result[0]
+        for field in ["credit_amount", "debit_amount", "total_amount", "currency"]:
+            assert field in transaction_summary
 
-        # Check all expected fields are present
-        for field in expected_fields:
-            assert field in weekly_summary
+
+def test_get_transactions_created_last_week(all_results):
+    result = all_results["get_transactions_created_last_week"]
+
+    # Basic assertions
+    assert isinstance(result, list)
+
+    if result:
+        weekly_summary = result[0]
+        assert _EXPECTED_CREATED_LAST_WEEK.issubset(weekly_summary)
 
         # Verify numeric fields have correct type
         numeric_fields = [
@@ -360,11 +532,13 @@ def test_get_transactions_created_last_week():
             "total_received",
             "highest_spend_amount",
         ]
-        for field in numeric_fields:
-            if weekly_summary[field] is not None:
-                assert isinstance(weekly_summary[field], (int, float, decimal.Decimal))
+        assert all(
+            isinstance(value, _NUMERIC)
+            for value in (weekly_summary[field] for field in numeric_fields)
+            if value is not None
+        )
 
-            # Verify category field is string if present
+        # Verify category field is string if present
         if weekly_summary["highest_spend_category"]:
             assert isinstance(weekly_summary["highest_spend_category"], str)
 
@@ -376,32 +550,17 @@ def test_get_transactions_created_last_week():
             expected_total = (
                 weekly_summary["total_received"] + weekly_summary["total_spent"]
             )
-            assert abs(weekly_summary["total_sum"] - expected_total) < 0.01
-
+            assert abs(weekly_summary["total_sum"] - expected_total) < _EPS
 
-def test_get_withdrawals_over_last_days():
-    # Test parameters
-    min_amount = 100000.00
-    days = 50
 
-    # Execute function with test parameters
-    result = get_withdrawals_over_last_days(min_amount, ID, days)
+def test_get_withdrawals_over_last_days(all_results):
+    result = all_results["get_withdrawals_over_last_days"]
 
     # Basic assertions
     assert isinstance(result, list)
 
     withdrawal_summary = result[0]
-    expected_fields = [
-        "total_sum",
-        "total_spent",
-        "total_received",
-        "highest_spend_category",
-        "highest_category_amount",
-    ]
-
-    # Check all expected fields are present
-    for field in expected_fields:
-        assert field in withdrawal_summary
+    assert _EXPECTED_WITHDRAWALS_OVER_LAST_DAYS.issubset(withdrawal_summary)
 
     # Verify numeric fields have correct type
     numeric_fields = [
@@ -410,9 +569,11 @@ def test_get_withdrawals_over_last_days():
         "total_received",
         "highest_category_amount",
     ]
-    for field in numeric_fields:
-        if withdrawal_summary[field] is not None:
-            assert isinstance(withdrawal_summary[field], (int, float, decimal.Decimal))
+    assert all(
+        isinstance(value, _NUMERIC)
+        for value in (withdrawal_summary[field] for field in numeric_fields)
+        if value is not None
+    )
 
     # Verify category field is string if present
     if withdrawal_summary["highest_spend_category"]:
@@ -426,29 +587,17 @@ def test_get_withdrawals_over_last_days():
         expected_total = (
             withdrawal_summary["total_received"] + withdrawal_summary["total_spent"]
         )
-        assert abs(withdrawal_summary["total_sum"] - expected_total) < 0.01
+        assert abs(withdrawal_summary["total_sum"] - expected_total) < _EPS
 
 
-def test_get_transactions_updated_since():
-    # Test parameters
-    specific_date = "2024-02-01 00:00:00"
-    result = get_transactions_updated_since(specific_date, ID)
+def test_get_transactions_updated_since(all_results):
+    result = all_results["get_transactions_updated_since"]
 
     # Basic assertions
     assert isinstance(result, list)
 
     transaction_summary = result[0]
-    expected_fields = [
-        "total_sum",
-        "total_spent",
-        "total_received",
-        "highest_spend_category",
-        "highest_spend_amount",
-    ]
-
-    # Check all expected fields are present
-    for field in expected_fields:
-        assert field in transaction_summary
+    assert _EXPECTED_UPDATED_SINCE.issubset(transaction_summary)
 
     # Verify numeric fields
     numeric_fields = [
@@ -457,40 +606,25 @@ def test_get_transactions_updated_since():
         "total_received",
         "highest_spend_amount",
     ]
-    for field in numeric_fields:
-        if transaction_summary[field] is not None:
-            assert isinstance(transaction_summary[field], (int, float, decimal.Decimal))
+    assert all(
+        isinstance(value, _NUMERIC)
+        for value in (transaction_summary[field] for field in numeric_fields)
+        if value is not None
+    )
 
     # Verify category field is string if present
     if transaction_summary["highest_spend_category"]:
         assert isinstance(transaction_summary["highest_spend_category"], str)
 
 
-def test_get_transactions_between_amounts_and_category():
-    # Test parameters
-    min_amount = 100000.00
-    max_amount = 1000000.00
-    category = "transfer"
-
-    result = get_transactions_between_amounts_and_category(
-        min_amount, max_amount, category, ID
-    )
+def test_get_transactions_between_amounts_and_category(all_results):
+    result = all_results["get_transactions_between_amounts_and_category"]
 
     # Basic assertions
     assert isinstance(result, list)
 
     transaction_summary = result[0]
-    expected_fields = [
-        "total_sum",
-        "total_spent",
-        "total_received",
-        "highest_spend_category",
-        "highest_category_amount",
-    ]
-
-    # Check all expected fields are present
-    for field in expected_fields:
-        assert field in transaction_summary
+    assert _EXPECTED_BETWEEN_AMOUNTS_AND_CATEGORY.issubset(transaction_summary)
 
     # Verify numeric fields
     numeric_fields = [
@@ -499,21 +633,19 @@ def test_get_transactions_between_amounts_and_category():
         "total_received",
         "highest_category_amount",
     ]
-    for field in numeric_fields:
-        if transaction_summary[field] is not None:
-            assert isinstance(transaction_summary[field], (int, float, decimal.Decimal))
+    assert all(
+        isinstance(value, _NUMERIC)
+        for value in (transaction_summary[field] for field in numeric_fields)
+        if value is not None
+    )
 
     # Verify category field is string if present
     if transaction_summary["highest_spend_category"]:
         assert isinstance(transaction_summary["highest_spend_category"], str)
 
 
-def test_get_transactions_by_bank_and_category():
-    # Test parameters
-    bank_name = "GTBank"
-    category = "transfer"
-
-    result = get_transactions_by_bank_and_category(bank_name, category, ID)
+def test_get_transactions_by_bank_and_category(all_results):
+    result = all_results["get_transactions_by_bank_and_category"]
 
     # Basic assertions
     assert isinstance(result, list)
@@ -526,6 +658,65 @@ def test_get_transactions_by_bank_and_category():
         assert field in transaction_summary
 
     # Verify all fields are numeric
-    for field in expected_fields:
-        if transaction_summary[field] is not None:
-            assert isinstance(transaction_summary[field], (int, float, decimal.Decimal))
+    assert all(
+        isinstance(value, _NUMERIC)
+        for value in (transaction_summary[field] for field in expected_fields)
+        if value is not None
+    )
+
+
+def test_get_multi_facet_sums(all_results):
+    result = all_results["get_multi_facet_sums"]
+
+    # Basic assertions
+    assert isinstance(result, list)
+
+    # Only the account total and the requested facets are returned
+    facets = {row["facet"] for row in result}
+    assert facets <= {"account_id", "bank_name", "category"}
+    assert "account_id" in facets
+
+    expected_fields = ["credit_amount", "debit_amount", "total_amount", "currency"]
+    for row in result:
+        for field in expected_fields:
+            assert field in row
+
+    # Facet rows match the single-facet queries
+    by_facet = {row["facet"]: row for row in result}
+    if "bank_name" in by_facet:
+        single = all_results["get_transactions_by_bank_name"][0]
+        assert by_facet["bank_name"]["total_amount"] == single["total_amount"]
+
+
+def test_get_all_summaries(all_results):
+    result = all_results["get_all_summaries"]
+
+    # Basic assertions
+    assert isinstance(result, list)
+    assert {row["level"] for row in result} <= {"account", "category"}
+
+    accounts = {row["currency"]: row for row in result if row["level"] == "account"}
+    categories = [row for row in result if row["level"] == "category"]
+    if not accounts:
+        assert not categories
+        return
+
+    # Category rows add up to the account row of their currency
+    for currency, account in accounts.items():
+        in_currency = [row for row in categories if row["currency"] == currency]
+        for field in ["credit_amount", "debit_amount", "total_amount"]:
+            assert abs(sum(row[field] for row in in_currency) - account[field]) < _EPS
+
+    # The account rows match the dedicated summary queries
+    summary = all_results["get_all_transactions"][0]
+    account = accounts[summary["currency"]]
+    assert abs(account["total_amount"] - summary["total_amount"]) < _EPS
+    assert abs(account["credit_amount"] - summary["total_credit"]) < _EPS
+    assert abs(account["debit_amount"] - summary["total_debit"]) < _EPS
+
+    deposits = all_results["get_deposits"][0]
+    withdrawals = all_results["get_withdrawals"][0]
+    credit = sum(row["credit_amount"] for row in accounts.values())
+    debit = sum(row["debit_amount"] for row in accounts.values())
+    assert abs(credit - deposits["total_deposits"]) < _EPS
+    assert abs(debit - withdrawals["total_withdrawals"]) < _EPS